@@ -13,13 +13,19 @@ FTIR光谱数据处理工具
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.widgets import SpanSelector
 from matplotlib.font_manager import FontProperties
 from scipy.signal import find_peaks
 import logging
+import re
+import csv
+import mmap
+from datetime import datetime
+import bisect
+import concurrent.futures
+from collections import defaultdict, deque
 from typing import Optional, Tuple, Dict, Any, List
 
 # 导入专业处理类
@@ -78,6 +84,27 @@ class SpectralProcessorGUI:
     AUTHOR_NAME = "zjnuxsl"
     AUTHOR_EMAIL = "sl-xiao@zjnu.cn"
 
+    # 日志级别识别（预编译正则，一次扫描代替逐级子串查找）
+    LOG_LEVEL_PATTERN = re.compile(r' - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ')
+    LOG_LEVEL_TAGS = {
+        'DEBUG': 'DEBUG',
+        'INFO': 'INFO',
+        'WARNING': 'WARNING',
+        'ERROR': 'ERROR',
+        'CRITICAL': 'CRITICAL',
+    }
+
+    # 日志显示区域最多显示的行数（更早的日志可通过"加载更早日志"按需加载）
+    LOG_MAX_DISPLAY_LINES = 5000
+
+    # 光谱曲线抽稀时按每像素保留最小/最大值两个点，坐标轴宽度不足该像素数时按该值计算
+    PLOT_MIN_DECIMATION_WIDTH = 800
+
+    # 后台计算任务完成状态的轮询间隔（毫秒）
+    BACKGROUND_POLL_INTERVAL = 50
+    # 积分上下限输入的防抖延迟（毫秒）：连续输入时只在最后一次修改后刷新图形
+    RANGE_CHANGE_DELAY = 150
+
     def __init__(self, root):
         """
         初始化FTIR光谱处理GUI
@@ -113,10 +140,29 @@ class SpectralProcessorGUI:
         self.interactive_mode = False  # 交互式选择模式开关
         self.span_selector = None  # SpanSelector对象
         self.selected_range_index = None  # 当前选中的区间索引
+        self._smooth_ranges = []  # 平滑区间列表 [(起点, 终点), ...]，与区间列表框逐行对应
         self.preview_timer = None  # 实时预览定时器（用于防抖）
+        self.range_change_timer = None  # 积分上下限输入的刷新定时器（用于防抖）
         self.auto_preview_var = tk.BooleanVar(value=False)  # 实时预览开关（提前初始化）
         self.preview_in_progress = False  # 标志：是否正在执行预览
 
+        # 平滑/基线页面缓存的曲线对象（复用 Line2D，避免每次 ax.clear() 后重建）
+        self._raw_line = None  # 平滑页面原始数据曲线
+        self._smoothed_line = None  # 平滑页面平滑结果曲线
+        self._baseline_data_line = None  # 基线页面待校正数据曲线
+        self._baseline_line = None  # 基线页面基线曲线
+        self._corrected_line = None  # 基线页面校正结果曲线
+        self._tight_layout_figs = set()  # 已执行过 tight_layout 的图形
+        self._plot_line_sources = {}  # 缓存曲线的数据 {属性名: (x_data, y_data, 全范围抽稀x, 全范围抽稀y)}，用于按可见范围抽稀
+        self._decimation_axes = set()  # 已注册横坐标范围变化回调的坐标轴
+        self._canvas_tabs = {}  # 画布所在的标签页 {画布: 标签页框架}
+        self._deferred_draws = {}  # 所在标签页未显示、推迟到切换标签页时绘制的图形 {画布: 图形}
+
+        # 平滑/基线校正在后台线程执行，避免阻塞界面（单线程，保证任务按提交顺序完成）
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._pool_futures = set()  # 已提交到线程池、尚未完成的任务（关闭窗口时取消）
+        self._export_futures = set()  # 其中的文件导出任务（关闭窗口时不取消，退出前等待写完）
+
         # 区间边界拖动相关
         self.dragging_boundary = None  # 正在拖动的边界 (range_index, 'start'/'end')
         self.boundary_drag_threshold = 20  # 边界检测阈值（像素）
@@ -125,9 +171,27 @@ class SpectralProcessorGUI:
         self.peak_interactive_mode = False  # 峰分析交互式选择模式开关
         self.peak_span_selector = None  # 峰分析SpanSelector对象
         self.peak_analysis_results = []  # 存储峰分析结果列表
+        self._result_rows = {}  # 结果表格各行的值 {iid: (文件名, 编号, 波数, ...)}，与表格行顺序一致
+        self._result_iids_by_peak = defaultdict(list)  # 按峰编号索引的结果表格行 {peak_number: [iid, ...]}
+        self._exporting_peak_results = False  # 是否正在后台导出峰分析结果
         self.analyzed_ranges = []  # 存储已分析的区间 [(lower, upper, peak_number, file_name), ...]
-        self.peak_range_artists = []  # 存储区间可视化对象（用于在图形上绘制）
+        self.peak_range_artists = {}  # 已分析区间的图形对象 {区间编号: [artist, ...]}
+        self._range_ids = {}  # 已分析区间的唯一编号 {id(range_data): 区间编号}；峰编号会复用，不能用区间内容作键
+        self._range_index = defaultdict(list)  # 已分析区间索引 {(round(lower*100), round(upper*100), peak_number): [range_data, ...]}
+        self._range_lows = []  # 按区间左端点排序的左端点列表
+        self._range_sorted = []  # 与 _range_lows 对应的 (右端点, 序号, range_data)
+        self._range_seq = 0  # 区间添加序号（保持与 analyzed_ranges 相同的先后顺序）
+        self._range_max_width = 0.0  # 已添加区间的最大宽度（用于限定查找范围）
+        self._peak_plot_version = 0  # 已分析区间或结果表格发生实际变化时递增，用于跳过无效的重绘
+        self._peak_wavenumbers = np.empty(0)  # 峰列表各行的波数（与峰列表行顺序一致）
+        self._peak_heights = np.empty(0)  # 峰列表各行的峰高（与峰列表行顺序一致）
+        self._peak_dataset_name = ""  # 峰列表所属的数据集名称
+        self._peak_row_index = {}  # 峰列表行在 _peak_wavenumbers 中的位置 {iid: index}
+        self._peak_overlay_artists = []  # 峰标记和积分范围预览的图形对象
+        self._peak_overlay_data = None  # 峰标记图层对应的数据集Y轴数据（None表示图层不可单独更新）
+        self._peak_overlay_labels = ()  # 峰标记图层中出现在图例里的标签
         self.peak_selected_range = None  # 存储当前交互式选择的区域 (xmin, xmax)
+        self._value_range_cache = {}  # 数据范围缓存 {'x' 或数据类型: (数组, (最小值, 最大值))}
         self.peak_context_menu = None  # 峰分析右键菜单
 
         # 多数据集对比分析相关
@@ -138,6 +202,14 @@ class SpectralProcessorGUI:
         self.has_performed_peak_finding = False  # 标志：是否已执行过寻峰操作
         self.dataset_switched = False  # 标志：数据集是否已切换（用于控制Y轴范围重置）
 
+        # 日志管理相关（增量读取日志文件）
+        self.all_log_lines = []  # 已读取的全部日志行
+        self._filtered_log_lines = []  # 符合当前筛选条件的日志行
+        self._log_display_count = 0  # 当前显示的日志行数（_filtered_log_lines 末尾部分）
+        self._log_display_limit = self.LOG_MAX_DISPLAY_LINES  # 当前允许显示的最大行数
+        self._log_offset = 0  # 日志文件已读取到的字节偏移
+        self._log_inode = None  # 日志文件标识（用于检测文件被替换）
+
         # 初始化图形属性
         self.smooth_ax1 = None  # 平滑页面图1
         self.smooth_ax2 = None  # 平滑页面图2
@@ -173,6 +245,21 @@ class SpectralProcessorGUI:
             if hasattr(self, 'preview_timer') and self.preview_timer is not None:
                 self.root.after_cancel(self.preview_timer)
                 self.preview_timer = None
+            if hasattr(self, 'range_change_timer') and self.range_change_timer is not None:
+                self.root.after_cancel(self.range_change_timer)
+                self.range_change_timer = None
+
+            # 【修复】正在导出文件时拒绝关闭，避免留下写了一半的CSV文件
+            if self._exporting_peak_results:
+                messagebox.showwarning("警告", "正在导出峰分析结果，请等待导出完成后再关闭！")
+                return
+
+            # 停止后台计算线程池：取消尚未开始的计算任务，不等待正在执行的任务
+            # （shutdown 的 cancel_futures 参数需要 Python 3.9+，这里逐个取消以兼容 3.8）
+            for future in list(self._pool_futures):
+                if future not in self._export_futures:
+                    future.cancel()
+            self._pool.shutdown(wait=False)
 
             # 关闭所有 matplotlib 图形
             plt.close('all')
@@ -282,12 +369,14 @@ class SpectralProcessorGUI:
         """更新所有图形的 y 轴标题"""
         y_label = self.y_label_var.get()
 
-        # 更新平滑处理页面的图形
+        # 更新平滑处理页面的图形（标题长度变化后需要重新计算布局）
         if hasattr(self, 'smooth_ax1') and self.smooth_ax1 is not None:
             self.smooth_ax1.set_ylabel(y_label)
         if hasattr(self, 'smooth_ax2') and self.smooth_ax2 is not None:
             self.smooth_ax2.set_ylabel(y_label)
         if hasattr(self, 'smooth_canvas'):
+            self._tight_layout_figs.discard(self.smooth_fig)
+            self._tight_layout_once(self.smooth_fig)
             self.smooth_canvas.draw()
 
         # 更新基线校正页面的图形
@@ -296,6 +385,8 @@ class SpectralProcessorGUI:
         if hasattr(self, 'baseline_ax2') and self.baseline_ax2 is not None:
             self.baseline_ax2.set_ylabel(y_label)
         if hasattr(self, 'baseline_canvas'):
+            self._tight_layout_figs.discard(self.baseline_fig)
+            self._tight_layout_once(self.baseline_fig)
             self.baseline_canvas.draw()
     
     def create_main_frame(self):
@@ -320,6 +411,9 @@ class SpectralProcessorGUI:
         self.create_baseline_page()
         self.create_peak_analysis_page()
         self.create_log_management_page()
+
+        # 切换标签页时补绘该页推迟的图形
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
         
     def create_smooth_page(self):
         """创建平滑处理页面"""
@@ -448,6 +542,9 @@ class SpectralProcessorGUI:
                                      command=self.smooth_data)
         self.smooth_btn.pack(fill=tk.X, pady=2)
 
+        # 后台平滑进度条（仅在处理期间显示）
+        self.smooth_progress = ttk.Progressbar(button_frame, mode='indeterminate')
+
         ttk.Button(button_frame, text="💾 导出数据",
                   command=self.export_smooth_data).pack(fill=tk.X, pady=2)
 
@@ -467,6 +564,8 @@ class SpectralProcessorGUI:
         self.smooth_fig.subplots_adjust(hspace=0.35)
 
         self.smooth_canvas = FigureCanvasTkAgg(self.smooth_fig, master=plot_frame)
+        self._canvas_tabs[self.smooth_canvas] = self.smooth_frame
+        self._bind_layout_reset(self.smooth_canvas, self.smooth_fig)
 
         # 初始化空图，设置默认横坐标范围（FTIR标准：4000-400 cm⁻¹）
         self.smooth_ax1.set_xlabel('波数 (cm$^{-1}$)')
@@ -562,7 +661,10 @@ class SpectralProcessorGUI:
         self.update_baseline_params()
         
         # 执行和导出按钮
-        ttk.Button(control_frame, text="执行校正", command=self.correct_baseline).pack(pady=5)
+        self.baseline_btn = ttk.Button(control_frame, text="执行校正", command=self.correct_baseline)
+        self.baseline_btn.pack(pady=5)
+        # 后台校正进度条（仅在处理期间显示，位于执行按钮下方）
+        self.baseline_progress = ttk.Progressbar(control_frame, mode='indeterminate')
         ttk.Button(control_frame, text="导出数据", command=self.export_baseline_data).pack(pady=5)
         
         # 创建右侧图形区域
@@ -576,6 +678,8 @@ class SpectralProcessorGUI:
         self.baseline_fig.subplots_adjust(hspace=0.35)
 
         self.baseline_canvas = FigureCanvasTkAgg(self.baseline_fig, master=plot_frame)
+        self._canvas_tabs[self.baseline_canvas] = self.baseline_frame
+        self._bind_layout_reset(self.baseline_canvas, self.baseline_fig)
 
         # 初始化空图，设置默认横坐标范围（FTIR标准：4000-400 cm⁻¹）
         self.baseline_ax1.set_xlabel('波数 (cm$^{-1}$)')
@@ -656,10 +760,12 @@ class SpectralProcessorGUI:
             self.peak_original_xlim = None
             self.peak_original_ylim = None
 
+            x_data = self.x_data.copy()
             self.loaded_datasets.append({
                 'name': self.current_file_name,
-                'x_data': self.x_data.copy(),
+                'x_data': x_data,
                 'y_data': self.y_data.copy(),
+                'x_sorter': np.argsort(x_data, kind='stable'),  # 波数排序索引（用于区间查找）
                 'checked': True
             })
             logger.info(f"已将数据添加到特征峰分析数据集列表: {self.current_file_name}")
@@ -727,13 +833,12 @@ class SpectralProcessorGUI:
         for file_path in file_paths:
             try:
                 # 读取CSV文件
-                data = pd.read_csv(file_path)
-                if data.shape[1] < 2:
+                _, columns = self.data_manager.read_spectrum_columns(file_path)
+                if columns is None:
                     failed_files.append(f"{os.path.basename(file_path)}: 列数不足")
                     continue
 
-                x_data = data.iloc[:, 0].values
-                y_data = data.iloc[:, 1].values
+                x_data, y_data = columns
                 file_name = os.path.splitext(os.path.basename(file_path))[0]
 
                 # 添加到数据集列表（默认勾选）
@@ -741,6 +846,7 @@ class SpectralProcessorGUI:
                     'name': file_name,
                     'x_data': x_data,
                     'y_data': y_data,
+                    'x_sorter': np.argsort(x_data, kind='stable'),  # 波数排序索引（用于区间查找）
                     'checked': True  # 默认勾选
                 })
                 success_count += 1
@@ -867,8 +973,7 @@ class SpectralProcessorGUI:
 
             # 清空峰列表（因为数据集已清空）
             if hasattr(self, 'peaks_tree'):
-                for item in self.peaks_tree.get_children():
-                    self.peaks_tree.delete(item)
+                self._clear_peak_tree()
                 logger.info("已清空峰列表")
 
             self.update_datasets_tree()
@@ -1078,53 +1183,98 @@ class SpectralProcessorGUI:
         # 设置新的定时器
         self.preview_timer = self.root.after(500, self._execute_preview)
 
+    def _get_smooth_params(self, method):
+        """
+        读取并解析当前平滑方法的参数
+
+        Args:
+            method: 平滑方法名称
+
+        Returns:
+            dict: 平滑方法的参数
+
+        Raises:
+            ValueError: 参数格式不正确
+        """
+        params = {}
+        if method == "savgol":
+            window_length = int(self.window_length_var.get())
+            # 确保窗口长度是奇数
+            if window_length % 2 == 0:
+                window_length += 1
+            params['window_length'] = window_length
+            params['polyorder'] = int(self.polyorder_var.get())
+        elif method == "lowess":
+            params['frac'] = float(self.lowess_frac_var.get())
+            params['iterations'] = int(self.lowess_iterations_var.get())
+        elif method in ["moving_average", "median"]:
+            window_length = int(self.window_length_var.get())
+            # 中值滤波器也需要奇数窗口
+            if method == "median" and window_length % 2 == 0:
+                window_length += 1
+            params['window_length'] = window_length
+        elif method == "gaussian":
+            params['sigma'] = float(self.sigma_var.get())
+        return params
+
     def _execute_preview(self):
         """执行实时预览（不保存到历史记录）"""
-        # 【修复】检查是否已有预览正在执行
+        # 【修复】检查是否已有预览正在执行；参数可能已再次变化，等上一次完成后重新预览
         if self.preview_in_progress:
-            logger.debug("上一次预览尚未完成，跳过本次预览")
+            logger.debug("上一次预览尚未完成，稍后重新预览")
+            self._schedule_preview()
             return
 
         if not self.check_data_loaded():
             return
 
         try:
-            # 设置预览进行中标志
-            self.preview_in_progress = True
-
             method = self.smooth_method.get()
             ranges = self.get_selected_ranges()
 
-            # 准备参数
-            params = {}
-            if method == "savgol":
-                window_length = int(self.window_length_var.get())
-                # 确保窗口长度是奇数
-                if window_length % 2 == 0:
-                    window_length += 1
-                params['window_length'] = window_length
-                params['polyorder'] = int(self.polyorder_var.get())
-            elif method == "lowess":
-                params['frac'] = float(self.lowess_frac_var.get())
-                params['iterations'] = int(self.lowess_iterations_var.get())
-            elif method in ["moving_average", "median"]:
-                window_length = int(self.window_length_var.get())
-                # 中值滤波器也需要奇数窗口
-                if method == "median" and window_length % 2 == 0:
-                    window_length += 1
-                params['window_length'] = window_length
-            elif method == "gaussian":
-                params['sigma'] = float(self.sigma_var.get())
-
-            # 使用SmoothingProcessor进行平滑
-            success, smoothed_data, error_msg = self.smoothing_processor.smooth_data_in_ranges(
+            # 准备参数（在主线程中一次性读取并解析界面输入）
+            params = self._get_smooth_params(method)
+
+            # 【修复】平滑计算提交到后台线程池，拖动参数滑块时界面不再卡顿
+            future = self._submit_to_pool(
+                self.smoothing_processor.smooth_data_in_ranges,
                 self.x_data, self.y_data, ranges, method, **params
             )
+        except Exception as e:
+            logger.error(f"实时预览出错: {str(e)}")
+            return
+
+        # 设置预览进行中标志，预览完成时重置
+        self.preview_in_progress = True
+        self.root.after(self.BACKGROUND_POLL_INTERVAL, self._poll_preview,
+                        future, self.y_data, self.smoothed_data)
+
+    def _poll_preview(self, future, y_data, previous_smoothed):
+        """
+        在主线程中轮询后台预览任务，完成后更新平滑数据和图形
+
+        Args:
+            future: 后台平滑任务
+            y_data: 提交预览时的Y轴数据
+            previous_smoothed: 提交预览时的平滑数据
+        """
+        if not future.done():
+            self.root.after(self.BACKGROUND_POLL_INTERVAL, self._poll_preview,
+                            future, y_data, previous_smoothed)
+            return
+
+        try:
+            success, smoothed_data, error_msg = future.result()
+
+            # 预览期间加载了新数据、执行了平滑或撤销时丢弃预览结果
+            if y_data is not self.y_data or previous_smoothed is not self.smoothed_data:
+                logger.info("预览期间数据已更换，丢弃本次预览结果")
+                return
 
             if success:
                 # 临时更新平滑数据（不保存到历史）
-                # 使用 data_manager 的方法来设置数据
-                self.data_manager.set_smoothed_data(smoothed_data)
+                # 使用 data_manager 的方法来设置数据（平滑结果是新数组，无需再复制）
+                self.data_manager.set_smoothed_data(smoothed_data, copy=False)
 
                 # 重新绘制图形
                 self.plot_smooth_result()
@@ -1178,8 +1328,7 @@ class SpectralProcessorGUI:
             # start = max(start, min_wavenumber)
             # end = min(end, max_wavenumber)
 
-            range_str = f"{start:.2f} - {end:.2f}"
-            self.ranges_listbox.insert(tk.END, range_str)
+            range_str = self._insert_range(tk.END, start, end)
 
             logger.info(f"添加区间: {range_str}")
 
@@ -1212,7 +1361,7 @@ class SpectralProcessorGUI:
         selection = self.ranges_listbox.curselection()
         if selection:
             deleted_index = selection[0]
-            self.ranges_listbox.delete(selection)
+            self._delete_range_at(deleted_index)
 
             # 更新选中索引
             if self.selected_range_index == deleted_index:
@@ -1233,6 +1382,7 @@ class SpectralProcessorGUI:
     def clear_ranges(self):
         """清空所有范围"""
         self.ranges_listbox.delete(0, tk.END)
+        self._smooth_ranges.clear()
         self.selected_range_index = None
         # 更新图形显示区间高亮
         if self.data_manager.y_data is not None:
@@ -1337,7 +1487,7 @@ class SpectralProcessorGUI:
         if clicked_range_index is not None:
             # 如果是右键点击，删除该区间
             if event.button == 3:  # 右键
-                self.ranges_listbox.delete(clicked_range_index)
+                self._delete_range_at(clicked_range_index)
                 self.selected_range_index = None
                 self._draw_smooth_ranges()
                 self.smooth_canvas.draw()
@@ -1422,11 +1572,11 @@ class SpectralProcessorGUI:
         if has_merged:
             # 清空列表
             self.ranges_listbox.delete(0, tk.END)
+            self._smooth_ranges.clear()
 
             # 添加合并后的区间
             for start, end in merged:
-                range_str = f"{start:.2f} - {end:.2f}"
-                self.ranges_listbox.insert(tk.END, range_str)
+                self._insert_range(tk.END, start, end)
 
             logger.info(f"区间合并完成: {len(ranges)} → {len(merged)}")
             return True
@@ -1509,9 +1659,8 @@ class SpectralProcessorGUI:
                     end = new_x
 
             # 更新列表中的区间
-            range_str = f"{start:.2f} - {end:.2f}"
-            self.ranges_listbox.delete(range_idx)
-            self.ranges_listbox.insert(range_idx, range_str)
+            self._delete_range_at(range_idx)
+            self._insert_range(range_idx, start, end)
             self.ranges_listbox.selection_set(range_idx)
 
             # 注意：不在拖动过程中检查合并，只在拖动完成后检查
@@ -1563,7 +1712,7 @@ class SpectralProcessorGUI:
     def on_delete_key(self, event):
         """Delete键或Backspace键处理：删除选中的区间"""
         if self.selected_range_index is not None:
-            self.ranges_listbox.delete(self.selected_range_index)
+            self._delete_range_at(self.selected_range_index)
             self.selected_range_index = None
             self._draw_smooth_ranges()
             self.smooth_canvas.draw()
@@ -1591,13 +1740,44 @@ class SpectralProcessorGUI:
             self.smooth_canvas.draw()
 
     def get_selected_ranges(self):
-        """获取所有选择的范围"""
-        ranges = []
-        for i in range(self.ranges_listbox.size()):
-            range_str = self.ranges_listbox.get(i)
-            start, end = map(float, range_str.split(" - "))
-            ranges.append((start, end))
-        return ranges
+        """
+        获取所有选择的范围
+
+        鼠标移动时也会调用，直接返回已解析的区间列表，不再逐行读取并解析列表框文本。
+        """
+        return list(self._smooth_ranges)
+
+    def _insert_range(self, index, start, end):
+        """
+        在区间列表框和区间列表的相同位置插入一个区间
+
+        Args:
+            index: 插入位置（整数索引或 tk.END）
+            start: 区间起点
+            end: 区间终点
+
+        Returns:
+            str: 列表框中显示的区间文本
+        """
+        range_str = f"{start:.2f} - {end:.2f}"
+        self.ranges_listbox.insert(index, range_str)
+        # 保存与显示一致的数值（保留两位小数）
+        start, end = map(float, range_str.split(" - "))
+        if index == tk.END:
+            self._smooth_ranges.append((start, end))
+        else:
+            self._smooth_ranges.insert(index, (start, end))
+        return range_str
+
+    def _delete_range_at(self, index):
+        """
+        从区间列表框和区间列表中删除一个区间
+
+        Args:
+            index: 区间索引
+        """
+        self.ranges_listbox.delete(index)
+        del self._smooth_ranges[index]
 
     def _draw_smooth_ranges(self):
         """在图形上绘制选中的平滑区间高亮（带标签和编号）"""
@@ -1698,44 +1878,125 @@ class SpectralProcessorGUI:
             method = self.smooth_method.get()
             ranges = self.get_selected_ranges()
 
-            # 准备参数
-            params = {}
-            if method == "savgol":
-                window_length = int(self.window_length_var.get())
-                # 确保窗口长度是奇数
-                if window_length % 2 == 0:
-                    window_length += 1
-                params['window_length'] = window_length
-                params['polyorder'] = int(self.polyorder_var.get())
-            elif method == "lowess":
-                params['frac'] = float(self.lowess_frac_var.get())
-                params['iterations'] = int(self.lowess_iterations_var.get())
-            elif method in ["moving_average", "median"]:
-                window_length = int(self.window_length_var.get())
-                # 中值滤波器也需要奇数窗口
-                if method == "median" and window_length % 2 == 0:
-                    window_length += 1
-                params['window_length'] = window_length
-            elif method == "gaussian":
-                params['sigma'] = float(self.sigma_var.get())
-
-            # 使用SmoothingProcessor进行平滑
-            success, smoothed_data, error_msg = self.smoothing_processor.smooth_data_in_ranges(
+            # 准备参数（在主线程中一次性读取并解析界面输入）
+            params = self._get_smooth_params(method)
+
+            # 使用SmoothingProcessor在后台线程进行平滑，完成后在主线程更新结果
+            self._run_in_background(
+                self.smooth_btn, self.smooth_progress, self._finish_smooth_data,
+                self.smoothing_processor.smooth_data_in_ranges,
                 self.x_data, self.y_data, ranges, method, **params
             )
 
+        except ValueError as e:
+            messagebox.showerror("参数错误", f"参数格式不正确：{str(e)}")
+        except Exception as e:
+            messagebox.showerror("错误", f"平滑处理出错：{str(e)}")
+
+    def _run_in_background(self, button, progress, callback, func, *args, **kwargs):
+        """
+        在后台线程中执行耗时计算，完成后在主线程调用 callback(future, *args)
+
+        执行期间禁用触发按钮并显示不确定模式进度条，界面保持响应。
+
+        Args:
+            button: 触发计算的按钮
+            progress: 计算期间显示的进度条
+            callback: 计算完成后的回调函数
+            func: 要执行的计算函数
+            *args: 计算函数的位置参数（同时传给回调，用于校验数据是否已变化）
+            **kwargs: 计算函数的关键字参数
+        """
+        button.config(state=tk.DISABLED)
+        progress.pack(fill=tk.X, padx=5, pady=2, after=button)
+        progress.start(10)
+        future = self._submit_to_pool(func, *args, **kwargs)
+        self.root.after(self.BACKGROUND_POLL_INTERVAL, self._poll_background_task,
+                        future, button, progress, callback, args)
+
+    def _submit_to_pool(self, func, *args, **kwargs):
+        """
+        向后台线程池提交任务，并记录到 _pool_futures 以便关闭窗口时取消
+
+        Args:
+            func: 要执行的函数
+            *args: 函数的位置参数
+            **kwargs: 函数的关键字参数
+
+        Returns:
+            concurrent.futures.Future: 任务对象
+        """
+        future = self._pool.submit(func, *args, **kwargs)
+        self._pool_futures.add(future)
+        future.add_done_callback(self._pool_futures.discard)
+        return future
+
+    def _submit_export(self, func, *args, **kwargs):
+        """
+        向后台线程池提交文件导出任务
+
+        导出任务另外记录到 _export_futures：关闭窗口时不取消，程序退出前等待其写完，
+        不能像平滑/基线校正那样直接结束进程。
+
+        Args:
+            func: 要执行的导出函数
+            *args: 函数的位置参数
+            **kwargs: 函数的关键字参数
+
+        Returns:
+            concurrent.futures.Future: 任务对象
+        """
+        future = self._submit_to_pool(func, *args, **kwargs)
+        self._export_futures.add(future)
+        future.add_done_callback(self._export_futures.discard)
+        return future
+
+    def has_running_background_task(self):
+        """
+        检查后台线程池中是否有尚未完成的计算任务（不含文件导出任务）
+
+        Returns:
+            bool: 是否有尚未完成的计算任务
+        """
+        return any(not future.done() for future in list(self._pool_futures)
+                   if future not in self._export_futures)
+
+    def _poll_background_task(self, future, button, progress, callback, args):
+        """轮询后台计算任务，完成后恢复按钮和进度条并调用回调"""
+        if not future.done():
+            self.root.after(self.BACKGROUND_POLL_INTERVAL, self._poll_background_task,
+                            future, button, progress, callback, args)
+            return
+
+        progress.stop()
+        progress.pack_forget()
+        button.config(state=tk.NORMAL)
+        callback(future, *args)
+
+    def _finish_smooth_data(self, future, x_data, y_data, *_):
+        """在主线程中处理后台平滑的结果"""
+        try:
+            success, smoothed_data, error_msg = future.result()
+
+            # 计算期间加载了新数据时丢弃旧结果
+            if y_data is not self.y_data:
+                logger.info("平滑期间数据已更换，丢弃本次平滑结果")
+                messagebox.showinfo("提示", "平滑期间数据已更换，本次平滑结果已丢弃，请重新平滑")
+                return
+
             if success:
                 # 保存当前数据到历史（用于撤销）
                 # 如果已有平滑数据，保存到历史
+                # 平滑数据只会被整体替换、不会原地修改，直接保存引用即可
                 if self.smoothed_data is not None:
-                    self.smoothed_data_history.append(self.smoothed_data.copy())
+                    self.smoothed_data_history.append(self.smoothed_data)
                     # 限制历史记录数量为10
                     if len(self.smoothed_data_history) > 10:
                         self.smoothed_data_history.pop(0)
                     logger.info(f"保存平滑历史，当前历史记录数: {len(self.smoothed_data_history)}")
 
-                # 更新平滑数据
-                self.data_manager.set_smoothed_data(smoothed_data)
+                # 更新平滑数据（平滑结果是新数组，无需再复制）
+                self.data_manager.set_smoothed_data(smoothed_data, copy=False)
 
                 # 重新绘制图形
                 self.plot_smooth_result()
@@ -1743,8 +2004,6 @@ class SpectralProcessorGUI:
             else:
                 messagebox.showerror("错误", error_msg)
 
-        except ValueError as e:
-            messagebox.showerror("参数错误", f"参数格式不正确：{str(e)}")
         except Exception as e:
             messagebox.showerror("错误", f"平滑处理出错：{str(e)}")
 
@@ -1770,7 +2029,7 @@ class SpectralProcessorGUI:
 
         # 恢复上一次的数据
         previous_data = self.smoothed_data_history.pop()
-        self.data_manager.set_smoothed_data(previous_data)
+        self.data_manager.set_smoothed_data(previous_data, copy=False)
 
         # 重新绘制图形
         self.plot_smooth_result()
@@ -1865,23 +2124,263 @@ class SpectralProcessorGUI:
             elif method == "mixture_model":
                 params['num_knots'] = int(self.num_knots_var.get())
 
-            # 使用BaselineCorrector进行基线校正
-            success, corrected_data, baseline, error_msg = self.baseline_corrector.correct_baseline(
+            # 使用BaselineCorrector在后台线程进行基线校正，完成后在主线程更新结果
+            self._run_in_background(
+                self.baseline_btn, self.baseline_progress, self._finish_correct_baseline,
+                self.baseline_corrector.correct_baseline,
                 self.x_data, y_data, method, **params
             )
 
+        except ValueError as e:
+            messagebox.showerror("参数错误", f"参数格式不正确：{str(e)}")
+        except Exception as e:
+            messagebox.showerror("错误", f"基线校正出错：{str(e)}")
+
+    def _finish_correct_baseline(self, future, x_data, y_data, *_):
+        """在主线程中处理后台基线校正的结果"""
+        try:
+            success, corrected_data, baseline, error_msg = future.result()
+
+            # 计算期间加载了新数据或重新平滑时丢弃旧结果
+            if x_data is not self.x_data or (y_data is not self.y_data and y_data is not self.smoothed_data):
+                logger.info("基线校正期间数据已更换，丢弃本次校正结果")
+                messagebox.showinfo("提示", "基线校正期间数据已更换，本次校正结果已丢弃，请重新校正")
+                return
+
             if success:
-                self.data_manager.set_corrected_data(corrected_data)
-                self.plot_baseline_result(baseline, y_data, self.x_data)
+                self.data_manager.set_corrected_data(corrected_data, copy=False)
+                self.plot_baseline_result(baseline, y_data, x_data)
                 messagebox.showinfo("成功", "基线校正完成")
             else:
                 messagebox.showerror("错误", error_msg)
 
-        except ValueError as e:
-            messagebox.showerror("参数错误", f"参数格式不正确：{str(e)}")
         except Exception as e:
             messagebox.showerror("错误", f"基线校正出错：{str(e)}")
 
+    def _set_plot_line(self, attr, ax, x_data, y_data, fmt, label):
+        """
+        更新缓存的曲线对象，首次绘制时创建
+
+        复用 Line2D 并通过 set_data 更新数据，避免 ax.clear() 后重建全部对象、重算刻度。
+
+        Args:
+            attr: 缓存曲线的属性名
+            ax: 目标坐标轴
+            x_data: X轴数据
+            y_data: Y轴数据
+            fmt: 首次创建时使用的线型格式
+            label: 图例标签
+        """
+        line = getattr(self, attr)
+        source = self._plot_line_sources.get(attr)
+        if (line is not None and line.axes is ax and source is not None
+                and source[0] is x_data and source[1] is y_data):
+            # 数据未变化（如重复执行基线校正时的待校正数据），沿用上次的全范围抽稀结果
+            line.set_data(source[2], source[3])
+            line.set_label(label)
+            return
+
+        x_plot, y_plot = self._decimate(x_data, y_data, self._decimation_target(ax))
+        self._plot_line_sources[attr] = (x_data, y_data, x_plot, y_plot)
+
+        if line is None or line.axes is not ax:
+            line, = ax.plot(x_plot, y_plot, fmt, label=label)
+            setattr(self, attr, line)
+        else:
+            line.set_data(x_plot, y_plot)
+            line.set_label(label)
+
+        # 缩放/平移后按新的可见范围重新抽稀，保证放大后的细节
+        if ax not in self._decimation_axes:
+            ax.callbacks.connect('xlim_changed', self._on_spectrum_xlim_changed)
+            self._decimation_axes.add(ax)
+
+    def _decimation_target(self, ax):
+        """
+        计算曲线抽稀的目标分组数（坐标轴的像素宽度）
+
+        Args:
+            ax: 目标坐标轴
+
+        Returns:
+            int: 分组数
+        """
+        return max(int(ax.bbox.width), self.PLOT_MIN_DECIMATION_WIDTH)
+
+    @staticmethod
+    def _decimate(x_data, y_data, n_buckets):
+        """
+        按最小/最大值对曲线抽稀，使绘制的点数与屏幕分辨率相当
+
+        将数据等分为 n_buckets 组，每组保留最小值和最大值两个点（保持原有顺序），
+        并保留首尾两点，峰形和极值在屏幕上与完整数据一致。
+
+        Args:
+            x_data: X轴数据
+            y_data: Y轴数据
+            n_buckets: 分组数
+
+        Returns:
+            tuple: (抽稀后的X数据, 抽稀后的Y数据)；点数不多时原样返回
+        """
+        n = len(y_data)
+        if n_buckets <= 0 or n <= 2 * n_buckets:
+            return x_data, y_data
+
+        y_data = np.asarray(y_data)
+        bucket = -(-n // n_buckets)
+        full = n // bucket * bucket
+        starts = np.arange(0, full, bucket)
+        blocks = y_data[:full].reshape(-1, bucket)
+        parts = [[0, n - 1], starts + blocks.argmin(axis=1), starts + blocks.argmax(axis=1)]
+        if full < n:
+            tail = y_data[full:]
+            parts.append([full + int(tail.argmin()), full + int(tail.argmax())])
+        idx = np.unique(np.concatenate(parts))
+        return np.asarray(x_data)[idx], y_data[idx]
+
+    def _on_spectrum_xlim_changed(self, ax):
+        """
+        横坐标范围变化时，按可见范围重新抽稀该坐标轴上的缓存曲线
+
+        Args:
+            ax: 范围发生变化的坐标轴
+        """
+        lower, upper = sorted(ax.get_xlim())
+        n_buckets = self._decimation_target(ax)
+        for attr, (x_data, y_data, _, _) in self._plot_line_sources.items():
+            line = getattr(self, attr)
+            if line is None or line.axes is not ax:
+                continue
+            visible = np.flatnonzero((x_data >= lower) & (x_data <= upper))
+            if visible.size == 0:
+                continue
+            # 多保留可见范围两侧各一个点，使曲线延伸到边界
+            start = max(int(visible[0]) - 1, 0)
+            end = min(int(visible[-1]) + 2, len(x_data))
+            line.set_data(*self._decimate(x_data[start:end], y_data[start:end], n_buckets))
+
+    def _remove_plot_line(self, attr):
+        """
+        移除缓存的曲线对象
+
+        Args:
+            attr: 缓存曲线的属性名
+        """
+        self._plot_line_sources.pop(attr, None)
+        line = getattr(self, attr)
+        if line is None:
+            return
+        try:
+            line.remove()
+        except Exception as e:
+            logger.warning(f"移除曲线对象失败: {str(e)}")
+        setattr(self, attr, None)
+
+    def _refresh_spectrum_axes(self, ax, title):
+        """
+        刷新光谱坐标轴的标题、图例和显示范围
+
+        按当前曲线数据重新计算范围，保持横坐标倒置（FTIR标准：高波数在左，低波数在右）；
+        坐标轴上没有曲线时清除标题和图例。
+
+        Args:
+            ax: 目标坐标轴
+            title: 坐标轴标题
+        """
+        ax.set_xlabel('波数 (cm$^{-1}$)')
+        ax.set_ylabel(self.y_label_var.get())
+        ax.grid(True)
+        if ax.lines:
+            ax.set_title(title)
+            ax.legend()
+            ax.relim()
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+        else:
+            ax.set_title('')
+            legend = ax.get_legend()
+            if legend is not None:
+                legend.remove()
+        if not ax.xaxis_inverted():
+            ax.invert_xaxis()
+
+    def _draw_spectrum_figure(self, fig, canvas):
+        """
+        请求重绘图形，tight_layout 只在首次绘制时执行一次
+
+        画布所在的标签页未显示时（例如加载数据会同时更新平滑和基线两个页面）只记录下来，
+        切换到该页时再绘制，避免渲染看不到的图形；首次布局也因此按实际显示尺寸计算。
+
+        Args:
+            fig: 目标图形
+            canvas: 图形所在画布
+        """
+        tab = self._canvas_tabs.get(canvas)
+        if tab is not None and self.notebook.select() != str(tab):
+            self._deferred_draws[canvas] = fig
+            return
+        self._deferred_draws.pop(canvas, None)
+        self._tight_layout_once(fig)
+        canvas.draw_idle()
+
+    def _on_tab_changed(self, event):  # event用于Tkinter事件绑定
+        """
+        切换标签页时绘制该页推迟的图形
+
+        Args:
+            event: Tkinter事件对象（未使用但必须保留）
+        """
+        selected = self.notebook.select()
+        for canvas, fig in list(self._deferred_draws.items()):
+            if str(self._canvas_tabs[canvas]) == selected:
+                self._draw_spectrum_figure(fig, canvas)
+
+    def _tight_layout_once(self, fig):
+        """
+        对图形执行一次 tight_layout
+
+        布局只取决于图形尺寸和坐标轴标题，两者不变时之后的重绘跳过布局计算；
+        窗口尺寸变化或坐标轴标题改变时会从 _tight_layout_figs 中移除该图形，下次绘制时重新布局。
+
+        Args:
+            fig: 目标图形
+        """
+        if fig not in self._tight_layout_figs:
+            fig.tight_layout()
+            self._tight_layout_figs.add(fig)
+
+    def _bind_layout_reset(self, canvas, fig):
+        """
+        画布尺寸变化时清除图形的布局记录，使下次绘制时重新执行 tight_layout
+
+        Args:
+            canvas: 图形所在画布
+            fig: 目标图形
+        """
+        canvas.get_tk_widget().bind(
+            '<Configure>', lambda event: self._tight_layout_figs.discard(fig), add='+')
+
+    @staticmethod
+    def _datasets_extent(datasets, key):
+        """
+        计算多个数据集某一列数据的整体范围
+
+        逐个数据集用 NumPy 求最值，不把所有数据拼接成 Python 列表。
+
+        Args:
+            datasets: 数据集字典列表
+            key: 数据列的键名（'x_data' 或 'y_data'）
+
+        Returns:
+            Optional[Tuple[float, float]]: (最小值, 最大值)，没有数据时返回None
+        """
+        arrays = [ds[key] for ds in datasets if len(ds[key]) > 0]
+        if not arrays:
+            return None
+        return (min(float(np.min(a)) for a in arrays),
+                max(float(np.max(a)) for a in arrays))
+
     def plot_data(self):
         # 检查数据是否已加载
         if self.x_data is None or self.y_data is None:
@@ -1894,79 +2393,37 @@ class SpectralProcessorGUI:
         file_name = self.current_file_name if self.current_file_name else '数据'
 
         # 更新平滑处理页面的图形
-        self.smooth_ax1.clear()
-        self.smooth_ax2.clear()
-        self.smooth_ax1.plot(self.x_data, self.y_data, 'b-', label=file_name)
-        self.smooth_ax1.set_title('原始数据')
-        self.smooth_ax1.set_xlabel('波数 (cm$^{-1}$)')
-        self.smooth_ax1.set_ylabel(self.y_label_var.get())
-        self.smooth_ax1.legend()
-        self.smooth_ax1.grid(True)
-        # 倒置横坐标（FTIR标准：高波数在左，低波数在右）
-        self.smooth_ax1.invert_xaxis()
+        self._set_plot_line('_raw_line', self.smooth_ax1, self.x_data, self.y_data, 'b-', file_name)
+        self._refresh_spectrum_axes(self.smooth_ax1, '原始数据')
 
         # 绘制选中的区间高亮
         self._draw_smooth_ranges()
 
         # 如果存在平滑数据，则显示
         if self.smoothed_data is not None:
-            self.smooth_ax2.plot(self.x_data, self.smoothed_data, 'r-', label=f'{file_name}_平滑')
-            self.smooth_ax2.set_title('平滑后数据')
-            self.smooth_ax2.set_xlabel('波数 (cm$^{-1}$)')
-            self.smooth_ax2.set_ylabel(self.y_label_var.get())
-            self.smooth_ax2.legend()
-            self.smooth_ax2.grid(True)
-            # 倒置横坐标
-            self.smooth_ax2.invert_xaxis()
-
-        self.smooth_fig.tight_layout()
-        self.smooth_canvas.draw()
+            self._set_plot_line('_smoothed_line', self.smooth_ax2, self.x_data, self.smoothed_data,
+                                'r-', f'{file_name}_平滑')
+        else:
+            self._remove_plot_line('_smoothed_line')
+        self._refresh_spectrum_axes(self.smooth_ax2, '平滑后数据')
+
+        self._draw_spectrum_figure(self.smooth_fig, self.smooth_canvas)
         logger.info("plot_data: 平滑处理页面图谱绘制完成")
 
         # 更新基线校正页面的图形
-        self.baseline_ax1.clear()
-        self.baseline_ax2.clear()
-
-        # 根据数据源选择显示的数据
-        if self.data_source_var.get() == "smoothed" and self.smoothed_data is not None:
-            plot_data = self.smoothed_data
-            data_label = f'{file_name}_平滑'
-        else:
-            plot_data = self.y_data
-            data_label = file_name
-
-        self.baseline_ax1.plot(self.x_data, plot_data, 'b-', label=data_label)
-        self.baseline_ax1.set_title(data_label)
-        self.baseline_ax1.set_xlabel('波数 (cm$^{-1}$)')
-        self.baseline_ax1.set_ylabel(self.y_label_var.get())
-        self.baseline_ax1.legend()
-        self.baseline_ax1.grid(True)
-        # 倒置横坐标
-        self.baseline_ax1.invert_xaxis()
-        self.baseline_fig.tight_layout()
-        self.baseline_canvas.draw()
+        self.update_baseline_plot()
         logger.info("plot_data: 基线校正页面图谱绘制完成")
 
     def plot_smooth_result(self):
         # 获取文件名用于图例
         file_name = self.current_file_name if self.current_file_name else '数据'
 
-        self.smooth_ax2.clear()
-        self.smooth_ax2.plot(self.x_data, self.smoothed_data, 'r-', label=f'{file_name}_平滑')
-        self.smooth_ax2.set_title('平滑后数据')
-        self.smooth_ax2.set_xlabel('波数 (cm$^{-1}$)')
-        self.smooth_ax2.set_ylabel(self.y_label_var.get())
-        self.smooth_ax2.legend()
-        self.smooth_ax2.grid(True)
-        # 倒置横坐标
-        self.smooth_ax2.invert_xaxis()
-        self.smooth_fig.tight_layout()
-        self.smooth_canvas.draw()
+        self._set_plot_line('_smoothed_line', self.smooth_ax2, self.x_data, self.smoothed_data,
+                            'r-', f'{file_name}_平滑')
+        self._refresh_spectrum_axes(self.smooth_ax2, '平滑后数据')
+        self._draw_spectrum_figure(self.smooth_fig, self.smooth_canvas)
 
     def plot_baseline_result(self, baseline, plot_data, x_data):
-        self.baseline_ax1.clear()
-        self.baseline_ax2.clear()
-
         # 获取文件名用于图例
         file_name = self.current_file_name if self.current_file_name else '数据'
 
@@ -1977,28 +2434,16 @@ class SpectralProcessorGUI:
             data_label = file_name
 
         # 绘制数据和基线
-        self.baseline_ax1.plot(x_data, plot_data, 'b-', label=data_label)
-        self.baseline_ax1.plot(x_data, baseline, 'r--', label='基线')
-        self.baseline_ax1.set_title(f'{data_label}和基线')
-        self.baseline_ax1.set_xlabel('波数 (cm$^{-1}$)')
-        self.baseline_ax1.set_ylabel(self.y_label_var.get())
-        self.baseline_ax1.legend()
-        self.baseline_ax1.grid(True)
-        # 倒置横坐标
-        self.baseline_ax1.invert_xaxis()
+        self._set_plot_line('_baseline_data_line', self.baseline_ax1, x_data, plot_data, 'b-', data_label)
+        self._set_plot_line('_baseline_line', self.baseline_ax1, x_data, baseline, 'r--', '基线')
+        self._refresh_spectrum_axes(self.baseline_ax1, f'{data_label}和基线')
 
         # 绘制校正后的数据
-        self.baseline_ax2.plot(x_data, self.corrected_data, 'g-', label=f'{file_name}_基线校正')
-        self.baseline_ax2.set_title('基线校正后的数据')
-        self.baseline_ax2.set_xlabel('波数 (cm$^{-1}$)')
-        self.baseline_ax2.set_ylabel(self.y_label_var.get())
-        self.baseline_ax2.legend()
-        self.baseline_ax2.grid(True)
-        # 倒置横坐标
-        self.baseline_ax2.invert_xaxis()
+        self._set_plot_line('_corrected_line', self.baseline_ax2, x_data, self.corrected_data,
+                            'g-', f'{file_name}_基线校正')
+        self._refresh_spectrum_axes(self.baseline_ax2, '基线校正后的数据')
 
-        self.baseline_fig.tight_layout()
-        self.baseline_canvas.draw()
+        self._draw_spectrum_figure(self.baseline_fig, self.baseline_canvas)
 
     def export_smooth_data(self):
         """导出平滑后的数据"""
@@ -2075,9 +2520,6 @@ class SpectralProcessorGUI:
         if not self.check_data_loaded():
             return
 
-        self.baseline_ax1.clear()
-        self.baseline_ax2.clear()
-
         # 获取文件名用于图例
         file_name = self.current_file_name if self.current_file_name else '数据'
 
@@ -2089,17 +2531,15 @@ class SpectralProcessorGUI:
             plot_data = self.y_data
             data_label = file_name
 
-        self.baseline_ax1.plot(self.x_data, plot_data, 'b-', label=data_label)
-        self.baseline_ax1.set_title(data_label)
-        self.baseline_ax1.set_xlabel('波数 (cm$^{-1}$)')
-        self.baseline_ax1.set_ylabel(self.y_label_var.get())
-        self.baseline_ax1.legend()
-        self.baseline_ax1.grid(True)
-        # 倒置横坐标
-        self.baseline_ax1.invert_xaxis()
+        # 数据源变化后原有的基线和校正结果不再对应，移除
+        self._remove_plot_line('_baseline_line')
+        self._remove_plot_line('_corrected_line')
 
-        self.baseline_fig.tight_layout()
-        self.baseline_canvas.draw()
+        self._set_plot_line('_baseline_data_line', self.baseline_ax1, self.x_data, plot_data, 'b-', data_label)
+        self._refresh_spectrum_axes(self.baseline_ax1, data_label)
+        self._refresh_spectrum_axes(self.baseline_ax2, '')
+
+        self._draw_spectrum_figure(self.baseline_fig, self.baseline_canvas)
 
     def update_file_display(self, filename):
         """更新文件名显示"""
@@ -2234,12 +2674,12 @@ class SpectralProcessorGUI:
         self.peaks_tree.column('wavenumber', width=120, anchor='center')
         self.peaks_tree.column('height', width=100, anchor='center')
 
-        # 添加滚动条
-        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.peaks_tree.yview)
-        self.peaks_tree.configure(yscrollcommand=scrollbar.set)
+        # 添加滚动条（保存引用，批量更新峰列表时用于恢复pack顺序）
+        self.peaks_tree_scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.peaks_tree.yview)
+        self.peaks_tree.configure(yscrollcommand=self.peaks_tree_scrollbar.set)
 
         self.peaks_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.peaks_tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         # 添加选择事件绑定
         self.peaks_tree.bind('<<TreeviewSelect>>', self.on_peak_select)
@@ -2411,9 +2851,15 @@ class SpectralProcessorGUI:
         # 创建图形
         self.peak_fig, self.peak_ax = plt.subplots(figsize=(8, 6))
         self.peak_canvas = FigureCanvasTkAgg(self.peak_fig, master=plot_frame)
+        self._bind_layout_reset(self.peak_canvas, self.peak_fig)
         self.peak_canvas.draw()
         self.peak_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # 缓存画布的屏幕坐标（用于弹出右键菜单），窗口移动或尺寸变化时失效
+        self._peak_canvas_root_xy = None
+        self.peak_canvas.get_tk_widget().bind('<Configure>', self._invalidate_peak_canvas_root_xy, add='+')
+        self.root.bind('<Configure>', self._invalidate_peak_canvas_root_xy, add='+')
+
         # 添加工具栏
         toolbar = NavigationToolbar2Tk(self.peak_canvas, plot_frame)
 
@@ -2422,12 +2868,12 @@ class SpectralProcessorGUI:
         self.peak_original_ylim = None
 
         # 初始化缩放历史记录
-        self.peak_zoom_history = []  # 存储 (xlim, ylim) 元组
+        self.peak_zoom_history = deque(maxlen=50)  # 存储 (xlim, ylim) 元组（最多保留50个）
         self.peak_zoom_history_index = -1  # 当前历史记录索引
 
-        # 初始化矩形选框工具
-        from matplotlib.widgets import RectangleSelector
+        # 初始化矩形选框工具（首次切换到矩形选框模式时创建）
         self.peak_rect_selector = None
+        self._peak_active_tool_mode = None  # 当前已生效的工具模式
 
         # 绑定鼠标事件
         self.peak_canvas.mpl_connect('motion_notify_event', self.on_peak_mouse_move)
@@ -2460,10 +2906,20 @@ class SpectralProcessorGUI:
         """
         当上下限输入框的值改变时更新图形
 
+        每次按键都会触发该回调，这里只安排一次延迟刷新（防抖），
+        连续输入时只在最后一次修改 RANGE_CHANGE_DELAY 毫秒后重绘。
+
         Args:
             *args: Tkinter变量trace回调的标准参数（未使用但必须保留）
         """
-        self.update_peak_plot()
+        if self.range_change_timer is not None:
+            self.root.after_cancel(self.range_change_timer)
+        self.range_change_timer = self.root.after(self.RANGE_CHANGE_DELAY, self._execute_range_change)
+
+    def _execute_range_change(self):
+        """执行积分上下限变化后的图形刷新"""
+        self.range_change_timer = None
+        self._refresh_peak_overlay()
 
     def create_log_management_page(self):
         """创建日志管理页面"""
@@ -2483,7 +2939,10 @@ class SpectralProcessorGUI:
         ttk.Button(btn_inner_frame, text="清空日志",
                    command=self.clear_log).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(btn_inner_frame, text="导出日志",
-                   command=self.export_log).pack(side=tk.LEFT)
+                   command=self.export_log).pack(side=tk.LEFT, padx=(0, 5))
+        self.log_load_more_btn = ttk.Button(btn_inner_frame, text="加载更早日志",
+                                            command=self.load_more_log, state='disabled')
+        self.log_load_more_btn.pack(side=tk.LEFT)
 
         # ========== 筛选区域 ==========
         filter_frame = ttk.LabelFrame(main_container, text="筛选")
@@ -2543,6 +3002,28 @@ class SpectralProcessorGUI:
         # 初始加载日志
         self.refresh_log()
 
+    def _reset_peak_axes(self):
+        """
+        移除特征峰图中的全部曲线、填充、文字和图例，保留坐标轴本身和矩形缩放选择器
+
+        ax.clear() 会重建坐标轴、脊线和刻度，下一次绘制时还要重新创建全部刻度对象；
+        这里只移除绘制的图形对象，并恢复 clear() 后的数据范围和自动缩放状态。
+        """
+        ax = self.peak_ax
+        # 【修复】矩形缩放选择器只创建一次，它的选框和控制点也挂在坐标轴上，移除后拖动时将不再显示选框
+        rect_selector = getattr(self, 'peak_rect_selector', None)
+        keep = set(rect_selector.artists) if rect_selector is not None else set()
+        for artist in [*ax.lines, *ax.collections, *ax.patches, *ax.texts]:
+            if artist not in keep:
+                artist.remove()
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        ax.relim()
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_autoscale_on(True)
+
     def update_peak_plot(self):
         """更新特征峰分析图形（支持多数据集显示）"""
         logger.info(f"update_peak_plot: 开始更新图形，总数据集数: {len(self.loaded_datasets)}")
@@ -2555,8 +3036,8 @@ class SpectralProcessorGUI:
         checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
         logger.info(f"update_peak_plot: 勾选的数据集数量: {len(checked_datasets)}")
 
-        # 在 clear() 之前保存当前的视图范围（只在有勾选的数据集时）
-        # 关键：必须在 clear() 之前获取范围，否则会得到错误的默认范围
+        # 在清空坐标轴之前保存当前的视图范围（只在有勾选的数据集时）
+        # 关键：必须在清空之前获取范围，否则会得到错误的默认范围
         if checked_datasets:
             current_xlim = self.peak_ax.get_xlim()
             current_ylim = self.peak_ax.get_ylim()
@@ -2577,10 +3058,14 @@ class SpectralProcessorGUI:
             current_ylim = None
             logger.info("update_peak_plot: 没有勾选的数据集，不保存视图范围")
 
-        # 清空坐标轴
-        self.peak_ax.clear()
+        # 清空坐标轴上的图形对象（已分析区间的图形对象随之失效）
+        # 注意：图形通过 draw_idle() 在空闲时渲染，连续多次调用只会渲染一次
+        self._reset_peak_axes()
+        self.peak_range_artists.clear()
+        self._peak_overlay_artists = []
+        self._peak_overlay_data = None
 
-        # 如果存在 SpanSelector，需要重新创建（因为 clear() 会移除它）
+        # 如果存在 SpanSelector，需要重新创建（因为清空坐标轴会移除它）
         need_recreate_span_selector = False
         if hasattr(self, 'peak_span_selector') and self.peak_span_selector is not None:
             if self.peak_interactive_mode:
@@ -2595,16 +3080,15 @@ class SpectralProcessorGUI:
 
             # 清空峰列表（因为没有数据集）
             if hasattr(self, 'peaks_tree'):
-                for item in self.peaks_tree.get_children():
-                    self.peaks_tree.delete(item)
+                self._clear_peak_tree()
                 logger.info("update_peak_plot: 已清空峰列表（无勾选数据集）")
 
             self.peak_ax.set_xlabel('波数 (cm$^{-1}$)')
             self.peak_ax.set_ylabel('吸光度')
             self.peak_ax.set_xlim(4000, 400)  # 设置默认横坐标范围（左大右小）
             self.peak_ax.grid(True)
-            self.peak_fig.tight_layout()
-            self.peak_canvas.draw()
+            self._tight_layout_once(self.peak_fig)
+            self.peak_canvas.draw_idle()
             return
 
         # 显示勾选的数据集
@@ -2628,96 +3112,9 @@ class SpectralProcessorGUI:
         
         # 只在单个数据集时显示峰标记
         if y_data is not None and hasattr(self, 'x_data') and self.x_data is not None:
-            # 获取当前选中的峰
-            selected_items = self.peaks_tree.selection()
-
-            # 绘制所有峰值点
-            all_items = self.peaks_tree.get_children()
-            for idx, item in enumerate(all_items):
-                values = self.peaks_tree.item(item, 'values')
-                # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-                peak_wavenumber = float(values[1])
-                peak_idx = np.argmin(np.abs(self.x_data - peak_wavenumber))
-                peak_height = y_data[peak_idx]
-
-                if item in selected_items:
-                    # 选中的峰用绿色圆点标记
-                    self.peak_ax.plot(peak_wavenumber, peak_height, 'go',
-                                    markersize=8, label='选中峰' if item == selected_items[0] else "")
-                else:
-                    # 未选中的峰用蓝色圆点标记
-                    self.peak_ax.plot(peak_wavenumber, peak_height, 'bo',
-                                    markersize=8, label='峰值' if idx == 0 and not selected_items else "")
-
-            # 为所有选中的峰绘制垂直虚线（从X轴延伸到峰高位置）
-            if selected_items:
-                for idx, item in enumerate(selected_items):
-                    values = self.peaks_tree.item(item, 'values')
-                    # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-                    peak_wavenumber = float(values[1])
-                    peak_idx = np.argmin(np.abs(self.x_data - peak_wavenumber))
-                    peak_height = y_data[peak_idx]
-
-                    # 绘制垂直虚线（浅灰色，半透明）
-                    self.peak_ax.axvline(x=peak_wavenumber, ymin=0, ymax=1,
-                                       color='gray', linestyle=':', alpha=0.5, linewidth=1.5,
-                                       label='选中峰标记' if idx == 0 else "")
-        
-            # 绘制上下限虚线、连接线和积分区域填充（实时预览）
-            try:
-                if self.peak_lower_var.get() and self.peak_upper_var.get():
-                    lower = float(self.peak_lower_var.get())
-                    upper = float(self.peak_upper_var.get())
-
-                    # 确保lower < upper
-                    if lower > upper:
-                        lower, upper = upper, lower
-
-                    # 获取积分范围内的数据
-                    mask = (self.x_data >= lower) & (self.x_data <= upper)
-                    x_range = self.x_data[mask]
-                    y_range = y_data[mask]
-
-                    if len(x_range) > 0:
-                        # 找到上下限对应的y值
-                        lower_idx = np.argmin(np.abs(self.x_data - lower))
-                        upper_idx = np.argmin(np.abs(self.x_data - upper))
-                        lower_y = y_data[lower_idx]
-                        upper_y = y_data[upper_idx]
-
-                        # 计算基线（连接两端点的直线）
-                        baseline_slope = (upper_y - lower_y) / (upper - lower) if upper != lower else 0
-                        baseline_intercept = lower_y - baseline_slope * lower
-                        y_baseline = baseline_slope * x_range + baseline_intercept
-
-                        # 填充积分区域（半透明黄色）
-                        self.peak_ax.fill_between(x_range, y_baseline, y_range,
-                                                 alpha=0.3, color='yellow', label='积分区域')
-
-                        # 绘制竖向虚线（深灰色）
-                        self.peak_ax.axvline(x=lower, color='dimgray', linestyle='--', alpha=0.8)
-                        self.peak_ax.axvline(x=upper, color='dimgray', linestyle='--', alpha=0.8)
-
-                        # 绘制基线（黑色虚线）
-                        self.peak_ax.plot([lower, upper], [lower_y, upper_y],
-                                        color='black', linestyle='--', alpha=0.8, label='基线')
-
-                        # 计算并显示预估面积
-                        # 【修复】兼容 NumPy 旧版本，使用 trapz 而不是 trapezoid
-                        try:
-                            corrected_area = np.trapezoid(y_range - y_baseline, x_range)
-                        except AttributeError:
-                            corrected_area = np.trapz(y_range - y_baseline, x_range)
-
-                        # 在积分区域旁边显示面积值
-                        mid_x = (lower + upper) / 2
-                        mid_y = np.max(y_range) * 1.05  # 稍微高于峰顶
-                        self.peak_ax.text(mid_x, mid_y, f'面积: {corrected_area:.2f}',
-                                        ha='center', va='bottom', fontsize=9,
-                                        bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.5))
-
-            except ValueError:
-                pass  # 忽略无效的输入值
+            # 绘制峰标记、选中峰和积分范围预览
+            self._draw_peak_overlay(y_data, checked_datasets[0].get('x_sorter'))
+            self._peak_overlay_data = y_data
 
             # 绘制已分析的区间
             self.draw_analyzed_ranges_on_plot()
@@ -2732,13 +3129,9 @@ class SpectralProcessorGUI:
         if self.peak_original_xlim is None:
             # 第一次绘制，手动设置 Y 轴范围以确保数据完整显示
             # 收集所有勾选数据集的 Y 值，计算全局的最小值和最大值
-            all_y_values = []
-            for dataset in checked_datasets:
-                all_y_values.extend(dataset['y_data'])
-
-            if len(all_y_values) > 0:
-                y_min = np.min(all_y_values)
-                y_max = np.max(all_y_values)
+            y_extent = self._datasets_extent(checked_datasets, 'y_data')
+            if y_extent is not None:
+                y_min, y_max = y_extent
                 # 添加 5% 的边距，确保数据不会紧贴坐标轴边缘
                 y_range = y_max - y_min
                 y_margin = y_range * 0.05 if y_range > 0 else 0.05
@@ -2748,23 +3141,20 @@ class SpectralProcessorGUI:
                 logger.info(f"update_peak_plot: 第一次绘制，手动设置 Y 轴范围: [{y_lim_lower:.4f}, {y_lim_upper:.4f}]")
 
             # 【修复】第一次绘制时，直接设置 X 轴范围为 FTIR 标准倒序（左大右小）
-            all_x_values = []
-            for dataset in checked_datasets:
-                all_x_values.extend(dataset['x_data'])
-            if len(all_x_values) > 0:
-                x_min = np.min(all_x_values)
-                x_max = np.max(all_x_values)
+            x_extent = self._datasets_extent(checked_datasets, 'x_data')
+            if x_extent is not None:
+                x_min, x_max = x_extent
                 self.peak_ax.set_xlim(x_max, x_min)  # 左大右小（FTIR标准）
                 logger.info(f"update_peak_plot: 第一次绘制，设置 X 轴范围: [{x_max:.2f}, {x_min:.2f}] (倒序)")
 
-            # 在设置坐标轴范围后，调用 tight_layout()
-            self.peak_fig.tight_layout()
+            # 在设置坐标轴范围后调整布局（只在首次绘制时执行）
+            self._tight_layout_once(self.peak_fig)
 
             # 在 tight_layout 之后，重新设置 Y 轴范围（因为 tight_layout 可能会改变坐标轴范围）
-            if len(all_y_values) > 0:
+            if y_extent is not None:
                 self.peak_ax.set_ylim(y_lim_lower, y_lim_upper)
                 # 【修复】同时确保 X 轴范围保持倒序
-                if len(all_x_values) > 0:
+                if x_extent is not None:
                     self.peak_ax.set_xlim(x_max, x_min)
                 logger.info(f"update_peak_plot: tight_layout 后重新设置范围: X=[{x_max:.2f}, {x_min:.2f}], Y=[{y_lim_lower:.4f}, {y_lim_upper:.4f}]")
 
@@ -2794,12 +3184,9 @@ class SpectralProcessorGUI:
                     logger.info(f"update_peak_plot: 数据集已切换，保持X轴范围 xlim={corrected_xlim}，Y轴使用自动范围")
                 else:
                     # 【修复】没有保存的范围时，使用 FTIR 标准倒序
-                    all_x_values = []
-                    for dataset in checked_datasets:
-                        all_x_values.extend(dataset['x_data'])
-                    if len(all_x_values) > 0:
-                        x_min = np.min(all_x_values)
-                        x_max = np.max(all_x_values)
+                    x_extent = self._datasets_extent(checked_datasets, 'x_data')
+                    if x_extent is not None:
+                        x_min, x_max = x_extent
                         self.peak_ax.set_xlim(x_max, x_min)  # 左大右小
                     logger.info("update_peak_plot: 数据集已切换，X轴和Y轴都使用自动范围（X轴保持倒序）")
 
@@ -2824,31 +3211,24 @@ class SpectralProcessorGUI:
                         logger.info(f"update_peak_plot: 恢复视图范围 xlim={corrected_xlim}, ylim={current_ylim}")
                     else:
                         # 【修复】范围无效时，使用 FTIR 标准倒序
-                        all_x_values = []
-                        for dataset in checked_datasets:
-                            all_x_values.extend(dataset['x_data'])
-                        if len(all_x_values) > 0:
-                            x_min = np.min(all_x_values)
-                            x_max = np.max(all_x_values)
+                        x_extent = self._datasets_extent(checked_datasets, 'x_data')
+                        if x_extent is not None:
+                            x_min, x_max = x_extent
                             self.peak_ax.set_xlim(x_max, x_min)  # 左大右小
                         logger.info("update_peak_plot: 保存的范围无效，使用自动范围（X轴保持倒序）")
                 else:
                     # 【修复】没有保存的范围时，使用 FTIR 标准倒序
-                    all_x_values = []
-                    for dataset in checked_datasets:
-                        all_x_values.extend(dataset['x_data'])
-                    if len(all_x_values) > 0:
-                        x_min = np.min(all_x_values)
-                        x_max = np.max(all_x_values)
+                    x_extent = self._datasets_extent(checked_datasets, 'x_data')
+                    if x_extent is not None:
+                        x_min, x_max = x_extent
                         self.peak_ax.set_xlim(x_max, x_min)  # 左大右小
                     logger.info("update_peak_plot: 没有保存的范围，使用自动范围（X轴保持倒序）")
 
-            # 在设置坐标轴范围后，调用 tight_layout()
-            self.peak_fig.tight_layout()
+            # 在设置坐标轴范围后调整布局（只在首次绘制时执行）
+            self._tight_layout_once(self.peak_fig)
 
         # 如果需要重新创建 SpanSelector
         if need_recreate_span_selector:
-            from matplotlib.widgets import SpanSelector
             self.peak_span_selector = SpanSelector(
                 self.peak_ax,
                 self.on_peak_span_select,
@@ -2860,23 +3240,152 @@ class SpectralProcessorGUI:
             )
             logger.info("update_peak_plot: 重新创建了 SpanSelector")
 
-        self.peak_canvas.draw()
+        self.peak_canvas.draw_idle()
         logger.info("update_peak_plot: 图形绘制完成")
 
-    def draw_analyzed_ranges_on_plot(self):
-        """在峰分析图形上绘制已分析的区间（仅显示当前勾选数据集的区间）"""
-        if not hasattr(self, 'analyzed_ranges') or not self.analyzed_ranges:
-            return
+    def _draw_peak_overlay(self, y_data, x_sorter=None):
+        """
+        绘制峰标记、选中峰标记和积分范围预览（单数据集时的可变图层）
 
-        # 获取当前勾选的数据集名称列表
-        checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
-        checked_file_names = [ds['name'] for ds in checked_datasets]
+        新建的图形对象记录在 _peak_overlay_artists 中，选择或积分范围变化时
+        只需替换这一图层，无需清空坐标轴重绘整个光谱。
 
-        if not checked_file_names:
-            logger.info("draw_analyzed_ranges_on_plot: 没有勾选的数据集，不绘制区间")
-            return
+        Args:
+            y_data: 当前数据集的Y轴数据
+            x_sorter: 当前数据集X轴的排序索引（可选）
+        """
+        existing = set(self.peak_ax.get_children())
+
+        # 获取当前选中的峰
+        selected_items = self.peaks_tree.selection()
+
+        # 峰波数在寻峰时已缓存，一次二分查找得到所有峰在数据中的位置
+        peak_wavenumbers = self._peak_wavenumbers
+        peak_heights = y_data[self._nearest_indices(self.x_data, peak_wavenumbers,
+                                                    x_sorter)]
+        selected_mask = np.zeros(len(peak_wavenumbers), dtype=bool)
+        selected_rows = [self._peak_row_index[item] for item in selected_items
+                         if item in self._peak_row_index]
+        selected_mask[selected_rows] = True
+
+        # 未选中的峰用蓝色圆点标记，选中的峰用绿色圆点标记
+        if np.any(~selected_mask):
+            self.peak_ax.plot(peak_wavenumbers[~selected_mask], peak_heights[~selected_mask], 'bo',
+                            markersize=8, label='峰值' if not selected_items else "")
+        if selected_rows:
+            self.peak_ax.plot(peak_wavenumbers[selected_mask], peak_heights[selected_mask], 'go',
+                            markersize=8, label='选中峰')
+
+            # 为所有选中的峰绘制垂直虚线（浅灰色，半透明）
+            for idx, row in enumerate(selected_rows):
+                self.peak_ax.axvline(x=peak_wavenumbers[row], ymin=0, ymax=1,
+                                   color='gray', linestyle=':', alpha=0.5, linewidth=1.5,
+                                   label='选中峰标记' if idx == 0 else "")
+
+        # 绘制上下限虚线、连接线和积分区域填充（实时预览）
+        try:
+            if self.peak_lower_var.get() and self.peak_upper_var.get():
+                lower = float(self.peak_lower_var.get())
+                upper = float(self.peak_upper_var.get())
 
-        logger.info(f"draw_analyzed_ranges_on_plot: 当前勾选的数据集: {checked_file_names}")
+                # 确保lower < upper
+                if lower > upper:
+                    lower, upper = upper, lower
+
+                # 获取积分范围内的数据
+                mask = (self.x_data >= lower) & (self.x_data <= upper)
+                x_range = self.x_data[mask]
+                y_range = y_data[mask]
+
+                if len(x_range) > 0:
+                    # 找到上下限对应的y值
+                    lower_idx, upper_idx = self._nearest_indices(self.x_data, (lower, upper), x_sorter)
+                    lower_y = y_data[lower_idx]
+                    upper_y = y_data[upper_idx]
+
+                    # 计算基线（连接两端点的直线）
+                    baseline_slope = (upper_y - lower_y) / (upper - lower) if upper != lower else 0
+                    baseline_intercept = lower_y - baseline_slope * lower
+                    y_baseline = baseline_slope * x_range + baseline_intercept
+
+                    # 填充积分区域（半透明黄色）
+                    self.peak_ax.fill_between(x_range, y_baseline, y_range,
+                                             alpha=0.3, color='yellow', label='积分区域')
+
+                    # 绘制竖向虚线（深灰色）
+                    self.peak_ax.axvline(x=lower, color='dimgray', linestyle='--', alpha=0.8)
+                    self.peak_ax.axvline(x=upper, color='dimgray', linestyle='--', alpha=0.8)
+
+                    # 绘制基线（黑色虚线）
+                    self.peak_ax.plot([lower, upper], [lower_y, upper_y],
+                                    color='black', linestyle='--', alpha=0.8, label='基线')
+
+                    # 计算并显示预估面积
+                    # 【修复】兼容 NumPy 旧版本，使用 trapz 而不是 trapezoid
+                    try:
+                        uncorrected_area = np.trapezoid(y_range, x_range)
+                    except AttributeError:
+                        uncorrected_area = np.trapz(y_range, x_range)
+                    # 直线基线的梯形积分是精确的，由两端点的基线值直接求出，无需再构造差值数组
+                    baseline_area = 0.5 * (y_baseline[0] + y_baseline[-1]) * (x_range[-1] - x_range[0])
+                    corrected_area = uncorrected_area - baseline_area
+
+                    # 在积分区域旁边显示面积值
+                    mid_x = (lower + upper) / 2
+                    mid_y = np.max(y_range) * 1.05  # 稍微高于峰顶
+                    self.peak_ax.text(mid_x, mid_y, f'面积: {corrected_area:.2f}',
+                                    ha='center', va='bottom', fontsize=9,
+                                    bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.5))
+
+        except ValueError:
+            pass  # 忽略无效的输入值
+
+        self._peak_overlay_artists = [artist for artist in self.peak_ax.get_children()
+                                      if artist not in existing]
+        self._peak_overlay_labels = tuple(
+            label for label in (artist.get_label() for artist in self._peak_overlay_artists)
+            if label and not label.startswith('_'))
+
+    def _refresh_peak_overlay(self):
+        """
+        仅更新峰标记和积分范围预览图层
+
+        光谱曲线和已分析区间不变时（峰列表选择变化、输入积分上下限），移除旧图层并重绘，
+        跳过 clear() 和整条光谱的重新绘制；图形状态不一致时回退到完整的 update_peak_plot()。
+        """
+        checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
+        if (len(checked_datasets) != 1 or self._peak_overlay_data is None
+                or checked_datasets[0]['y_data'] is not self._peak_overlay_data
+                or self.x_data is not checked_datasets[0]['x_data']):
+            self.update_peak_plot()
+            return
+
+        for artist in self._peak_overlay_artists:
+            try:
+                artist.remove()
+            except Exception as e:
+                logger.warning(f"移除峰标记图形对象失败: {str(e)}")
+        old_labels = self._peak_overlay_labels
+        self._draw_peak_overlay(self._peak_overlay_data, checked_datasets[0].get('x_sorter'))
+        # 图例条目不变时沿用现有图例（图例保存的是句柄的样式副本，不依赖已移除的图形对象）
+        if self._peak_overlay_labels != old_labels:
+            self.peak_ax.legend()
+        self.peak_canvas.draw_idle()
+
+    def draw_analyzed_ranges_on_plot(self):
+        """在峰分析图形上绘制已分析的区间（仅显示当前勾选数据集的区间）"""
+        if not hasattr(self, 'analyzed_ranges') or not self.analyzed_ranges:
+            return
+
+        # 获取当前勾选的数据集名称列表
+        checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
+        checked_file_names = [ds['name'] for ds in checked_datasets]
+
+        if not checked_file_names:
+            logger.info("draw_analyzed_ranges_on_plot: 没有勾选的数据集，不绘制区间")
+            return
+
+        logger.info(f"draw_analyzed_ranges_on_plot: 当前勾选的数据集: {checked_file_names}")
 
         # 为每个已分析的区间绘制标记（仅绘制当前勾选数据集的区间）
         drawn_count = 0
@@ -2913,47 +3422,120 @@ class SpectralProcessorGUI:
                 logger.warning(f"draw_analyzed_ranges_on_plot: 找不到数据集: {file_name}")
                 continue
 
-            x_data = dataset['x_data']
-            y_data = dataset['y_data']
-            # 获取区间内的数据
-            mask = (x_data >= lower) & (x_data <= upper)
-            x_range = x_data[mask]
-            y_range = y_data[mask]
-
-            if len(x_range) > 0:
-                # 计算基线
-                lower_idx = np.argmin(np.abs(x_data - lower))
-                upper_idx = np.argmin(np.abs(x_data - upper))
-                lower_y = y_data[lower_idx]
-                upper_y = y_data[upper_idx]
-
-                baseline_slope = (upper_y - lower_y) / (upper - lower) if upper != lower else 0
-                baseline_intercept = lower_y - baseline_slope * lower
-                y_baseline = baseline_slope * x_range + baseline_intercept
-
-                # 填充积分区域（使用不同的颜色，更淡）
-                self.peak_ax.fill_between(x_range, y_baseline, y_range,
-                                         alpha=0.2, color='lightgreen', edgecolor='green', linewidth=1)
-
-                # 绘制边界虚线
-                self.peak_ax.axvline(x=lower, color='green', linestyle=':', alpha=0.6, linewidth=1)
-                self.peak_ax.axvline(x=upper, color='green', linestyle=':', alpha=0.6, linewidth=1)
-
-                # 添加峰编号标注
-                mid_x = (lower + upper) / 2
-                max_y = np.max(y_range)
-                self.peak_ax.text(mid_x, max_y * 1.1, f'#{peak_number}',
-                                ha='center', va='bottom', fontsize=10, fontweight='bold',
-                                bbox=dict(boxstyle='circle,pad=0.3', facecolor='lightgreen',
-                                        edgecolor='green', alpha=0.7))
-
+            artists = self._draw_analyzed_range_artists(
+                dataset['x_data'], dataset['y_data'], lower, upper, peak_number,
+                dataset.get('x_sorter'))
+            if artists:
+                self.peak_range_artists[self._range_ids[id(range_data)]] = artists
                 drawn_count += 1
                 logger.debug(f"draw_analyzed_ranges_on_plot: 绘制区间: 文件={file_name}, 峰编号={peak_number}, 区间={lower:.2f}-{upper:.2f}")
 
         logger.info(f"draw_analyzed_ranges_on_plot: 共绘制了 {drawn_count} 个区间")
 
+    def _draw_analyzed_range_artists(self, x_data, y_data, lower, upper, peak_number, x_sorter=None):
+        """
+        在峰分析图形上绘制单个已分析区间（积分区域、边界虚线和峰编号）
+
+        Args:
+            x_data: 数据集的X轴数据
+            y_data: 数据集的Y轴数据
+            lower: 区间下限
+            upper: 区间上限
+            peak_number: 峰编号
+            x_sorter: x_data 的排序索引（可选）
+
+        Returns:
+            list: 新创建的图形对象列表，区间内无数据时返回空列表
+        """
+        # 获取区间内的数据
+        mask = (x_data >= lower) & (x_data <= upper)
+        x_range = x_data[mask]
+        y_range = y_data[mask]
+
+        if len(x_range) == 0:
+            return []
+
+        # 计算基线
+        lower_idx, upper_idx = self._nearest_indices(x_data, (lower, upper), x_sorter)
+        lower_y = y_data[lower_idx]
+        upper_y = y_data[upper_idx]
+
+        baseline_slope = (upper_y - lower_y) / (upper - lower) if upper != lower else 0
+        baseline_intercept = lower_y - baseline_slope * lower
+        y_baseline = baseline_slope * x_range + baseline_intercept
+
+        artists = []
+
+        # 填充积分区域（使用不同的颜色，更淡）
+        artists.append(self.peak_ax.fill_between(x_range, y_baseline, y_range,
+                                                 alpha=0.2, color='lightgreen', edgecolor='green', linewidth=1))
+
+        # 绘制边界虚线
+        artists.append(self.peak_ax.axvline(x=lower, color='green', linestyle=':', alpha=0.6, linewidth=1))
+        artists.append(self.peak_ax.axvline(x=upper, color='green', linestyle=':', alpha=0.6, linewidth=1))
+
+        # 添加峰编号标注
+        mid_x = (lower + upper) / 2
+        max_y = np.max(y_range)
+        artists.append(self.peak_ax.text(mid_x, max_y * 1.1, f'#{peak_number}',
+                                         ha='center', va='bottom', fontsize=10, fontweight='bold',
+                                         bbox=dict(boxstyle='circle,pad=0.3', facecolor='lightgreen',
+                                                   edgecolor='green', alpha=0.7)))
+        return artists
+
+    def add_analyzed_range_to_plot(self, range_id, lower, upper, peak_number, file_name):
+        """
+        在图形上增量绘制一个新的已分析区间（不重绘整个图形）
+
+        仅当该区间所属数据集是当前唯一勾选的数据集时才绘制，
+        与 draw_analyzed_ranges_on_plot 的显示规则保持一致。
+
+        Args:
+            range_id: 区间编号（由 _add_analyzed_range 返回）
+            lower: 区间下限
+            upper: 区间上限
+            peak_number: 峰编号
+            file_name: 文件名
+        """
+        checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
+        if len(checked_datasets) != 1 or checked_datasets[0]['name'] != file_name:
+            return
+
+        dataset = checked_datasets[0]
+        artists = self._draw_analyzed_range_artists(
+            dataset['x_data'], dataset['y_data'], lower, upper, peak_number,
+            dataset.get('x_sorter'))
+        if artists:
+            self.peak_range_artists[range_id] = artists
+            self.peak_canvas.draw_idle()
+            logger.debug(f"add_analyzed_range_to_plot: 增量绘制区间: 文件={file_name}, 峰编号={peak_number}, 区间={lower:.2f}-{upper:.2f}")
+
+    def remove_analyzed_ranges_from_plot(self, range_ids):
+        """
+        从图形中移除已删除区间的图形对象（不重绘整个图形）
+
+        未绘制的区间（所属数据集未显示或区间内无数据）无需处理。
+
+        Args:
+            range_ids: 已删除区间的编号列表（由 _remove_analyzed_ranges 返回）
+
+        Returns:
+            bool: 是否移除成功；图形对象记录已失效时返回 False，需要重新绘制整个图形
+        """
+        removed = False
+        for range_id in range_ids:
+            for artist in self.peak_range_artists.pop(range_id, []):
+                if artist.axes is not self.peak_ax:
+                    return False
+                artist.remove()
+                removed = True
+
+        if removed:
+            self.peak_canvas.draw_idle()
+        return True
+
     def draw_analyzed_ranges(self):
-        """更新峰分析图形，重新绘制已分析的区间"""
+        """更新峰分析图形，完整重建所有已分析的区间（用于数据集切换等场景）"""
         self.update_peak_plot()
 
     def on_peak_mouse_move(self, event):
@@ -3019,7 +3601,7 @@ class SpectralProcessorGUI:
                 self.peak_canvas.draw_idle()
                 return  # 平移时不显示提示框
 
-        if len(self.peaks_tree.get_children()) == 0:
+        if len(self._peak_wavenumbers) == 0:
             return
 
         # 获取当前数据
@@ -3042,33 +3624,25 @@ class SpectralProcessorGUI:
             return
 
         # 查找最近的峰
-        min_distance = float('inf')
         nearest_peak = None
         nearest_peak_height = None
 
         try:
-            for item in self.peaks_tree.get_children():
-                values = self.peaks_tree.item(item, 'values')
-                if len(values) < 3:
-                    logger.warning(f"峰列表数据格式错误: {values}")
-                    continue
-
-                # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-                peak_wavenumber = float(values[1])
-                peak_idx = np.argmin(np.abs(self.x_data - peak_wavenumber))
-                peak_height = y_data[peak_idx]
-
-                # 计算距离（只考虑x方向，转换为像素坐标）
-                # 使用transData将数据坐标转换为显示坐标
-                peak_display = self.peak_ax.transData.transform([[peak_wavenumber, peak_height]])[0]
-                mouse_display = self.peak_ax.transData.transform([[mouse_x, mouse_y]])[0]
-
-                distance = abs(peak_display[0] - mouse_display[0])
-
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_peak = peak_wavenumber
-                    nearest_peak_height = peak_height
+            # 鼠标移动时频繁触发：所有峰的位置一次二分查找，坐标一次批量变换
+            peak_wavenumbers = self._peak_wavenumbers
+            peak_heights = y_data[self._nearest_indices(self.x_data, peak_wavenumbers,
+                                                        self._get_x_sorter(self.x_data))]
+
+            # 计算距离（只考虑x方向，转换为像素坐标）
+            # 使用transData将数据坐标转换为显示坐标
+            peak_display = self.peak_ax.transData.transform(np.column_stack((peak_wavenumbers, peak_heights)))
+            mouse_display = self.peak_ax.transData.transform([[mouse_x, mouse_y]])[0]
+
+            distances = np.abs(peak_display[:, 0] - mouse_display[0])
+            nearest_idx = int(np.argmin(distances))
+            min_distance = distances[nearest_idx]
+            nearest_peak = float(peak_wavenumbers[nearest_idx])
+            nearest_peak_height = peak_heights[nearest_idx]
 
             # 如果距离小于阈值（20像素），显示提示框
             if min_distance <= 20 and nearest_peak is not None:
@@ -3143,10 +3717,7 @@ class SpectralProcessorGUI:
         selection = self.peaks_tree.selection()
         if selection:
             # 以选中峰为中心
-            values = self.peaks_tree.item(selection[0], 'values')
-            # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-            peak_wavenumber = float(values[1])
-            center_x = peak_wavenumber
+            center_x = self._peak_row_wavenumber(selection[0])
         else:
             # 以鼠标位置为中心
             center_x = event.xdata if event.xdata is not None else (xlim[0] + xlim[1]) / 2
@@ -3290,27 +3861,13 @@ class SpectralProcessorGUI:
                 messagebox.showerror("错误", error_msg)
                 return
 
-            # 清空现有峰列表
-            for item in self.peaks_tree.get_children():
-                self.peaks_tree.delete(item)
+            # 用寻峰结果重新填充峰列表
+            self._populate_peak_tree(dataset_name, peak_list)
 
             if len(peak_list) == 0:
                 messagebox.showinfo("提示", "未找到符合条件的峰！请调整阈值或最小距离参数。")
                 return
 
-            # 添加找到的峰（文件名、波数和峰高），并设置交替行背景色
-            for idx, (wavenumber, height) in enumerate(peak_list):
-                row_tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-                self.peaks_tree.insert(
-                    '', 'end',
-                    values=(dataset_name, f"{wavenumber:.2f}", f"{height:.4f}"),
-                    tags=(row_tag,)
-                )
-
-            # 配置峰列表的斑马纹背景色
-            self.peaks_tree.tag_configure('evenrow', background='white')
-            self.peaks_tree.tag_configure('oddrow', background='#F5F5F5')
-
             # 设置已执行寻峰标志
             self.has_performed_peak_finding = True
             logger.info("已设置寻峰标志，后续切换数据集将自动寻峰")
@@ -3350,40 +3907,135 @@ class SpectralProcessorGUI:
             if not success:
                 logger.warning(f"自动寻峰失败: {error_msg}")
                 # 清空峰列表
-                for item in self.peaks_tree.get_children():
-                    self.peaks_tree.delete(item)
+                self._populate_peak_tree(dataset_name, [])
                 return
 
-            # 清空现有峰列表
-            for item in self.peaks_tree.get_children():
-                self.peaks_tree.delete(item)
+            # 用寻峰结果重新填充峰列表
+            self._populate_peak_tree(dataset_name, peak_list)
 
             if len(peak_list) == 0:
                 logger.info(f"自动寻峰: 数据集 '{dataset_name}' 未找到符合条件的峰")
                 return
 
+            # 更新图形
+            self.update_peak_plot()
+
+            logger.info(f"自动寻峰成功: 数据集 '{dataset_name}' 找到 {len(peak_list)} 个峰")
+
+        except ValueError as e:
+            logger.error(f"自动寻峰参数错误: {str(e)}")
+        except Exception as e:
+            logger.error(f"自动寻峰出错: {str(e)}")
+
+    def _populate_peak_tree(self, dataset_name, peak_list):
+        """
+        清空并重新填充峰列表（find_peaks 与自动寻峰共用）
+
+        批量更新期间暂时将峰列表从布局中移除，避免每次删除/插入都触发重新布局。
+
+        Args:
+            dataset_name: 数据集名称（显示在文件名列）
+            peak_list: 峰列表 [(波数, 高度), ...]，为空时仅清空列表
+        """
+        pack_info = self.peaks_tree.pack_info()
+        self.peaks_tree.pack_forget()
+        try:
+            # 清空现有峰列表
+            self._clear_peak_tree()
+
             # 添加找到的峰（文件名、波数和峰高），并设置交替行背景色
+            wavenumbers = []
+            heights = []
             for idx, (wavenumber, height) in enumerate(peak_list):
                 row_tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-                self.peaks_tree.insert(
+                wavenumber_text = f"{wavenumber:.2f}"
+                height_text = f"{height:.4f}"
+                item = self.peaks_tree.insert(
                     '', 'end',
-                    values=(dataset_name, f"{wavenumber:.2f}", f"{height:.4f}"),
+                    values=(dataset_name, wavenumber_text, height_text),
                     tags=(row_tag,)
                 )
+                self._peak_row_index[item] = idx
+                # 缓存与列表显示一致的波数和峰高，绘图和导出时无需再逐行解析
+                wavenumbers.append(float(wavenumber_text))
+                heights.append(float(height_text))
+            self._peak_wavenumbers = np.array(wavenumbers, dtype=float)
+            self._peak_heights = np.array(heights, dtype=float)
+            self._peak_dataset_name = dataset_name
+        finally:
+            pack_info.pop('in', None)
+            self.peaks_tree.pack(before=self.peaks_tree_scrollbar, **pack_info)
 
-            # 配置峰列表的斑马纹背景色
+        # 配置峰列表的斑马纹背景色
+        if peak_list:
             self.peaks_tree.tag_configure('evenrow', background='white')
             self.peaks_tree.tag_configure('oddrow', background='#F5F5F5')
 
-            # 更新图形
-            self.update_peak_plot()
+    def _peak_row_wavenumber(self, item):
+        """
+        获取峰列表某一行的峰波数（取自缓存数组，不解析列表中的文本）
 
-            logger.info(f"自动寻峰成功: 数据集 '{dataset_name}' 找到 {len(peak_list)} 个峰")
+        Args:
+            item: 峰列表行的iid
 
-        except ValueError as e:
-            logger.error(f"自动寻峰参数错误: {str(e)}")
-        except Exception as e:
-            logger.error(f"自动寻峰出错: {str(e)}")
+        Returns:
+            float: 峰波数
+        """
+        return float(self._peak_wavenumbers[self._peak_row_index[item]])
+
+    def _clear_peak_tree(self):
+        """清空峰列表及其缓存的峰波数和峰高（单次Tcl调用批量删除）"""
+        children = self.peaks_tree.get_children()
+        if children:
+            self.peaks_tree.delete(*children)
+        self._peak_wavenumbers = np.empty(0)
+        self._peak_heights = np.empty(0)
+        self._peak_dataset_name = ""
+        self._peak_row_index = {}
+
+    def _get_x_sorter(self, x_data):
+        """
+        获取X轴数据的排序索引
+
+        优先复用加载数据集时缓存的排序索引，找不到对应数据集时临时计算。
+
+        Args:
+            x_data: X轴数据（波数）
+
+        Returns:
+            np.ndarray: x_data 的排序索引
+        """
+        for dataset in self.loaded_datasets:
+            if dataset['x_data'] is x_data and dataset.get('x_sorter') is not None:
+                return dataset['x_sorter']
+        return np.argsort(x_data, kind='stable')
+
+    @staticmethod
+    def _nearest_indices(x_data, values, sorter=None):
+        """
+        查找与各目标值最接近的数据点索引
+
+        使用排序索引进行二分查找，代替对每个目标值做一次 np.argmin(np.abs(x_data - value))。
+
+        Args:
+            x_data: X轴数据（波数）
+            values: 目标值数组
+            sorter: x_data 的排序索引（np.argsort 的结果），为None时临时计算
+
+        Returns:
+            np.ndarray: 各目标值最接近的数据点索引
+        """
+        values = np.asarray(values, dtype=float)
+        if sorter is None:
+            sorter = np.argsort(x_data, kind='stable')
+        pos = np.searchsorted(x_data, values, sorter=sorter)
+        left = sorter[np.clip(pos - 1, 0, len(sorter) - 1)]
+        right = sorter[np.clip(pos, 0, len(sorter) - 1)]
+        left_dist = np.abs(x_data[left] - values)
+        right_dist = np.abs(x_data[right] - values)
+        # 距离相同时取原始顺序靠前的点，与 np.argmin 一致
+        use_left = (left_dist < right_dist) | ((left_dist == right_dist) & (left < right))
+        return np.where(use_left, left, right)
 
     def clear_peak_selection(self):
         """清除当前的峰选择（仅清空输入框，不清除峰列表选择）"""
@@ -3401,7 +4053,7 @@ class SpectralProcessorGUI:
 
     def export_peak_list(self):
         """导出峰列表"""
-        if len(self.peaks_tree.get_children()) == 0:
+        if len(self._peak_wavenumbers) == 0:
             messagebox.showwarning("警告", "峰列表为空！请先进行寻峰。")
             return
 
@@ -3426,21 +4078,13 @@ class SpectralProcessorGUI:
             if not file_path:
                 return
 
-            filenames = []
-            peaks = []
-            heights = []
-            for item in self.peaks_tree.get_children():
-                values = self.peaks_tree.item(item, 'values')
-                filenames.append(values[0])
-                peaks.append(float(values[1]))
-                heights.append(float(values[2]))
-
-            df = pd.DataFrame({
-                "文件名": filenames,
-                "峰位置(cm^-1)": peaks,
-                "峰高度": heights
-            })
-            df.to_csv(file_path, index=False, encoding='utf-8-sig')
+            # 直接使用寻峰时缓存的数组逐行写入CSV，无需逐行读取峰列表，也无需构造DataFrame
+            with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["文件名", "峰位置(cm^-1)", "峰高度"])
+                writer.writerows(
+                    (self._peak_dataset_name, wavenumber, height)
+                    for wavenumber, height in zip(self._peak_wavenumbers.tolist(), self._peak_heights.tolist()))
             logger.info(f"峰列表已导出: {os.path.basename(file_path)}")
             messagebox.showinfo("成功", "峰列表导出成功！")
 
@@ -3491,9 +4135,7 @@ class SpectralProcessorGUI:
             y_data = self.data_manager.get_data(data_type)
 
             # 获取选中峰的波数
-            values = self.peaks_tree.item(selection[0], 'values')
-            # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-            peak_wavenumber = float(values[1])
+            peak_wavenumber = self._peak_row_wavenumber(selection[0])
 
             # 使用PeakAnalyzer进行峰分析
             success, results, error_msg = self.peak_analyzer.analyze_peak(
@@ -3540,13 +4182,9 @@ class SpectralProcessorGUI:
 
             # 找到区间内的峰
             peak_wavenumber = None
-            for item in self.peaks_tree.get_children():
-                values = self.peaks_tree.item(item, 'values')
-                # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-                wn = float(values[1])
-                if lower <= wn <= upper:
-                    peak_wavenumber = wn
-                    break
+            in_range = np.flatnonzero((self._peak_wavenumbers >= lower) & (self._peak_wavenumbers <= upper))
+            if len(in_range) > 0:
+                peak_wavenumber = float(self._peak_wavenumbers[in_range[0]])
 
             if peak_wavenumber is None:
                 messagebox.showerror("错误", "未找到区间内的峰")
@@ -3563,7 +4201,7 @@ class SpectralProcessorGUI:
 
             if success:
                 # 获取峰编号
-                peak_number = len(self.result_tree.get_children()) + 1
+                peak_number = len(self._result_rows) + 1
 
                 # 获取当前勾选的数据集名称
                 checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
@@ -3573,11 +4211,11 @@ class SpectralProcessorGUI:
                 self.add_result_to_table(peak_number, results, current_file_name)
 
                 # 记录已分析的区间（包含文件名）
-                self.analyzed_ranges.append((lower, upper, peak_number, current_file_name))
+                range_id = self._add_analyzed_range((lower, upper, peak_number, current_file_name))
                 logger.info(f"记录已分析区间: 文件={current_file_name}, 峰编号={peak_number}, 区间={lower:.2f}-{upper:.2f}")
 
-                # 在图形上绘制该区间
-                self.draw_analyzed_ranges()
+                # 在图形上增量绘制该区间
+                self.add_analyzed_range_to_plot(range_id, lower, upper, peak_number, current_file_name)
 
                 logger.info(f"峰 {peak_number} ({peak_wavenumber:.2f} cm⁻¹) 已添加到分析列表，区间: {lower:.2f} - {upper:.2f}")
 
@@ -3595,7 +4233,7 @@ class SpectralProcessorGUI:
     def display_peak_results(self, results):
         """显示峰分析结果（添加到表格）"""
         # 获取当前表格中的行数，作为峰编号
-        peak_number = len(self.result_tree.get_children()) + 1
+        peak_number = len(self._result_rows) + 1
 
         # 获取当前勾选的数据集名称
         checked_datasets = [ds for ds in self.loaded_datasets if ds.get('checked', True)]
@@ -3613,7 +4251,7 @@ class SpectralProcessorGUI:
         Args:
             event: Tkinter事件对象（未使用但必须保留）
         """
-        self.update_peak_plot()
+        self._refresh_peak_overlay()
 
     def toggle_peak_interactive_mode(self):
         """切换峰分析的交互式选择模式"""
@@ -3634,7 +4272,6 @@ class SpectralProcessorGUI:
                 logger.info("矩形选框工具已禁用（交互式选择模式启用）")
 
             # 创建SpanSelector
-            from matplotlib.widgets import SpanSelector
             self.peak_span_selector = SpanSelector(
                 self.peak_ax,
                 self.on_peak_span_select,
@@ -3649,7 +4286,7 @@ class SpectralProcessorGUI:
             self.peak_ax.set_xlim(current_xlim)
             self.peak_ax.set_ylim(current_ylim)
 
-            self.peak_canvas.draw()
+            self.peak_canvas.draw_idle()
         else:
             # 禁用交互式选择
             logger.info("峰分析交互式选择模式已禁用")
@@ -3668,7 +4305,7 @@ class SpectralProcessorGUI:
             self.peak_ax.set_xlim(current_xlim)
             self.peak_ax.set_ylim(current_ylim)
 
-            self.peak_canvas.draw()
+            self.peak_canvas.draw_idle()
 
     def on_peak_span_select(self, xmin, xmax):
         """峰分析SpanSelector回调函数"""
@@ -3754,7 +4391,7 @@ class SpectralProcessorGUI:
             - peak_count: 区间内的峰数量
             - message: 提示信息
         """
-        if len(self.peaks_tree.get_children()) == 0:
+        if len(self._peak_wavenumbers) == 0:
             return False, 0, "请先寻找峰！"
 
         # 确保lower < upper
@@ -3762,13 +4399,8 @@ class SpectralProcessorGUI:
             lower, upper = upper, lower
 
         # 统计区间内的峰数量
-        peaks_in_range = []
-        for item in self.peaks_tree.get_children():
-            values = self.peaks_tree.item(item, 'values')
-            # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-            peak_wavenumber = float(values[1])
-            if lower <= peak_wavenumber <= upper:
-                peaks_in_range.append(peak_wavenumber)
+        peak_wavenumbers = self._peak_wavenumbers
+        peaks_in_range = peak_wavenumbers[(peak_wavenumbers >= lower) & (peak_wavenumbers <= upper)]
 
         peak_count = len(peaks_in_range)
 
@@ -3786,7 +4418,7 @@ class SpectralProcessorGUI:
 
     def batch_analyze_peaks(self):
         """批量分析所有峰"""
-        if len(self.peaks_tree.get_children()) == 0:
+        if len(self._peak_wavenumbers) == 0:
             messagebox.showwarning("警告", "请先寻找峰！")
             return
 
@@ -3803,12 +4435,7 @@ class SpectralProcessorGUI:
             self.clear_result_table()
 
             # 获取所有峰的波数
-            peaks_wavenumbers = []
-            for item in self.peaks_tree.get_children():
-                values = self.peaks_tree.item(item, 'values')
-                # values[0] 是文件名，values[1] 是波数，values[2] 是峰高
-                peak_wavenumber = float(values[1])
-                peaks_wavenumbers.append(peak_wavenumber)
+            peaks_wavenumbers = self._peak_wavenumbers.tolist()
 
             # 【修复】定义 peak_count 变量
             peak_count = len(peaks_wavenumbers)
@@ -3904,16 +4531,16 @@ class SpectralProcessorGUI:
 
                 try:
                     # 找到区间内的峰位置（使用简单的最大值查找）
-                    # 找到x_data在区间内的索引
-                    mask = (x_data >= lower) & (x_data <= upper)
-                    if not np.any(mask):
+                    # 通过预先计算的排序索引二分查找区间内的索引
+                    range_indices = self._range_indices(x_data, lower, upper, dataset.get('x_sorter'))
+                    if len(range_indices) == 0:
                         failed_datasets.append(f"{file_name}: 区间内无数据")
                         logger.warning(f"数据集 {file_name} 在区间 {lower:.2f}-{upper:.2f} 内无数据")
                         continue
 
                     # 找到区间内的最大值位置作为峰位置
-                    y_in_range = y_data[mask]
-                    x_in_range = x_data[mask]
+                    y_in_range = y_data[range_indices]
+                    x_in_range = x_data[range_indices]
                     peak_idx = np.argmax(y_in_range)
                     peak_wavenumber = x_in_range[peak_idx]
 
@@ -3951,6 +4578,29 @@ class SpectralProcessorGUI:
             messagebox.showerror("错误", f"批量分析出错：{str(e)}")
             logger.exception("批量分析所有数据集出错")
 
+    @staticmethod
+    def _range_indices(x_data, lower, upper, sorter=None):
+        """
+        获取波数在 [lower, upper] 内的数据点索引
+
+        使用排序索引进行两次二分查找，代替对整个数组的布尔掩码扫描，
+        对升序、降序（FTIR常见）或无序的波数轴都适用。
+
+        Args:
+            x_data: X轴数据（波数）
+            lower: 区间下限
+            upper: 区间上限
+            sorter: x_data 的排序索引（np.argsort 的结果），为None时临时计算
+
+        Returns:
+            np.ndarray: 区间内数据点的索引（按原始顺序排列）
+        """
+        if sorter is None:
+            sorter = np.argsort(x_data, kind='stable')
+        start = np.searchsorted(x_data, lower, side='left', sorter=sorter)
+        end = np.searchsorted(x_data, upper, side='right', sorter=sorter)
+        return np.sort(sorter[start:end])
+
     def add_result_to_table(self, peak_number, results, file_name=None):
         """
         将分析结果添加到表格
@@ -3991,24 +4641,25 @@ class SpectralProcessorGUI:
             upper_limit_str = str(upper_limit)
 
         # 插入到表格（包含文件名和区间），并设置交替行背景色（模拟网格线效果）
-        row_count = len(self.result_tree.get_children())
+        row_count = len(self._result_rows)
         row_tag = 'evenrow' if row_count % 2 == 0 else 'oddrow'
 
-        self.result_tree.insert(
-            '', 'end',
-            values=(
-                file_name,
-                peak_number,
-                wavenumber_str,
-                f"{uncorrected_height:.4f}",
-                f"{corrected_height:.4f}",
-                lower_limit_str,
-                upper_limit_str,
-                f"{uncorrected_area:.4f}",
-                f"{corrected_area:.4f}"
-            ),
-            tags=(row_tag,)
+        values = (
+            file_name,
+            peak_number,
+            wavenumber_str,
+            f"{uncorrected_height:.4f}",
+            f"{corrected_height:.4f}",
+            lower_limit_str,
+            upper_limit_str,
+            f"{uncorrected_area:.4f}",
+            f"{corrected_area:.4f}"
         )
+        iid = self.result_tree.insert('', 'end', values=values, tags=(row_tag,))
+
+        # 同步保存行数据，避免后续逐行查询表格
+        self._result_rows[iid] = values
+        self._result_iids_by_peak[int(peak_number)].append(iid)
 
     def on_result_cell_double_click(self, event):
         """
@@ -4039,9 +4690,9 @@ class SpectralProcessorGUI:
                         cell_value = str(values[column_index])
 
                         # 复制到剪贴板
+                        # 程序持续运行时Tk会一直持有剪贴板内容，无需调用 update() 在事件回调中重入事件循环
                         self.root.clipboard_clear()
                         self.root.clipboard_append(cell_value)
-                        self.root.update()  # 确保剪贴板更新
 
                         # 获取列名
                         columns = ('文件名', '编号', '波数', '峰高', '校正峰高', '区间下限', '区间上限', '面积', '校正面积')
@@ -4098,12 +4749,14 @@ class SpectralProcessorGUI:
 
     def clear_result_table(self):
         """清空结果表格和已分析区间"""
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
+        children = self.result_tree.get_children()
+        if children:
+            self.result_tree.delete(*children)
+        self._result_rows.clear()
+        self._result_iids_by_peak.clear()
 
         # 清空已分析区间列表
-        if hasattr(self, 'analyzed_ranges'):
-            self.analyzed_ranges.clear()
+        self._clear_analyzed_ranges()
 
         # 【修复】清空峰分析区域的上下限输入框（避免显示黄色预览区域）
         if hasattr(self, 'peak_lower_var') and hasattr(self, 'peak_upper_var'):
@@ -4119,10 +4772,14 @@ class SpectralProcessorGUI:
 
     def export_peak_analysis_results(self):
         """导出峰分析结果到CSV文件"""
-        if len(self.result_tree.get_children()) == 0:
+        if not self._result_rows:
             messagebox.showwarning("警告", "没有可导出的分析结果！")
             return
 
+        if self._exporting_peak_results:
+            messagebox.showwarning("警告", "正在导出峰分析结果，请稍候！")
+            return
+
         try:
             # 默认打开 data/output 文件夹
             initial_dir = self.output_dir if os.path.exists(self.output_dir) else os.getcwd()
@@ -4131,14 +4788,11 @@ class SpectralProcessorGUI:
             # 检查是否是多数据集分析结果
             has_multiple_files = False
             file_names = set()
-            for item in self.result_tree.get_children():
-                values = self.result_tree.item(item)['values']
-                if values:  # 确保有数据
-                    file_names.add(values[0])  # 第一列是文件名
+            for values in self._result_rows.values():
+                file_names.add(values[0])  # 第一列是文件名
 
             if len(file_names) > 1:
                 has_multiple_files = True
-                from datetime import datetime
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 default_filename = f"多数据集峰分析结果_{timestamp}.csv"
             elif hasattr(self, 'current_file_name') and self.current_file_name:
@@ -4154,60 +4808,91 @@ class SpectralProcessorGUI:
             )
 
             if file_path:
-                # 收集表格数据
-                data = []
-                for item in self.result_tree.get_children():
-                    values = self.result_tree.item(item)['values']
-                    data.append(values)
+                # 在主线程中收集表格数据，文件写入提交到后台线程池，避免阻塞界面
+                data = list(self._result_rows.values())
+                dataset_count = len(file_names) if has_multiple_files else 0
 
-                # 创建DataFrame（包含文件名列和区间列）
-                df = pd.DataFrame(data, columns=['文件名', '编号', '波数', '峰高', '校正峰高', '区间下限', '区间上限', '面积', '校正面积'])
+                self._exporting_peak_results = True
+                future = self._submit_export(self._write_peak_results_csv, file_path, data, dataset_count)
+                self.root.after(self.BACKGROUND_POLL_INTERVAL, self._poll_peak_results_export, future)
 
-                # 导出到CSV
-                df.to_csv(file_path, index=False, encoding='utf-8-sig')
+        except Exception as e:
+            self._exporting_peak_results = False
+            messagebox.showerror("错误", f"导出出错：{str(e)}")
+            logger.exception("导出峰分析结果出错")
 
-                msg = f"峰分析结果已导出到:\n{file_path}"
-                if has_multiple_files:
-                    msg += f"\n\n包含 {len(file_names)} 个数据集的分析结果"
+    def _write_peak_results_csv(self, file_path, data, dataset_count):
+        """
+        在后台线程中将峰分析结果写入CSV文件（不访问任何Tk对象）
 
-                messagebox.showinfo("成功", msg)
-                logger.info(f"峰分析结果导出到: {file_path}, 包含 {len(data)} 条记录")
+        Args:
+            file_path: 导出文件路径
+            data: 表格各行的值列表
+            dataset_count: 多数据集结果包含的数据集数量（单数据集时为0）
+
+        Returns:
+            str: 导出成功的提示信息
+        """
+        # 直接写入CSV（包含文件名列和区间列），无需构造DataFrame
+        with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['文件名', '编号', '波数', '峰高', '校正峰高', '区间下限', '区间上限', '面积', '校正面积'])
+            writer.writerows(data)
+
+        msg = f"峰分析结果已导出到:\n{file_path}"
+        if dataset_count:
+            msg += f"\n\n包含 {dataset_count} 个数据集的分析结果"
+
+        logger.info(f"峰分析结果导出到: {file_path}, 包含 {len(data)} 条记录")
+        return msg
+
+    def _poll_peak_results_export(self, future):
+        """在主线程中轮询后台导出任务，完成后结束导出并显示结果提示"""
+        if not future.done():
+            self.root.after(self.BACKGROUND_POLL_INTERVAL, self._poll_peak_results_export, future)
+            return
 
+        self._exporting_peak_results = False
+        try:
+            msg = future.result()
         except Exception as e:
-            messagebox.showerror("错误", f"导出出错：{str(e)}")
             logger.exception("导出峰分析结果出错")
+            messagebox.showerror("错误", f"导出出错：{str(e)}")
+            return
+        messagebox.showinfo("成功", msg)
 
     def switch_peak_tool_mode(self):
         """切换峰分析图形的工具模式（矩形选框 / 平移 / 无）"""
         try:
             mode = self.peak_tool_mode.get()
 
+            # 模式未变化时无需更新
+            if mode == self._peak_active_tool_mode:
+                return
+            self._peak_active_tool_mode = mode
+
             if mode == "rect_zoom":
                 # 启用矩形选框模式
                 logger.info("切换到矩形选框模式")
 
-                # 禁用矩形选框（如果存在）
-                if self.peak_rect_selector is not None:
-                    self.peak_rect_selector.set_active(False)
-
-                # 创建新的矩形选框
-                from matplotlib.widgets import RectangleSelector
-                self.peak_rect_selector = RectangleSelector(
-                    self.peak_ax,
-                    self.on_rect_select,
-                    useblit=True,
-                    button=[1],  # 左键
-                    minspanx=5,
-                    minspany=5,
-                    spancoords='pixels',
-                    interactive=False,
-                    props=dict(facecolor='blue', alpha=0.2, edgecolor='blue', linewidth=2)
-                )
+                # 矩形选框只创建一次，之后通过 set_active 切换
+                if self.peak_rect_selector is None:
+                    from matplotlib.widgets import RectangleSelector
+                    self.peak_rect_selector = RectangleSelector(
+                        self.peak_ax,
+                        self.on_rect_select,
+                        useblit=True,
+                        button=[1],  # 左键
+                        minspanx=5,
+                        minspany=5,
+                        spancoords='pixels',
+                        interactive=False,
+                        props=dict(facecolor='blue', alpha=0.2, edgecolor='blue', linewidth=2)
+                    )
 
-                # 检查交互式选择模式是否已启用
+                # 交互式选择模式已启用时，矩形选框工具保持禁用
+                self.peak_rect_selector.set_active(not self.peak_interactive_mode)
                 if self.peak_interactive_mode:
-                    # 如果交互式选择模式已启用，禁用矩形选框工具
-                    self.peak_rect_selector.set_active(False)
                     logger.info("矩形选框工具未激活（交互式选择模式已启用）")
 
             elif mode == "pan":
@@ -4217,7 +4902,6 @@ class SpectralProcessorGUI:
                 # 禁用矩形选框
                 if self.peak_rect_selector is not None:
                     self.peak_rect_selector.set_active(False)
-                    self.peak_rect_selector = None
 
             else:
                 # 默认模式（无工具启用）
@@ -4226,9 +4910,6 @@ class SpectralProcessorGUI:
                 # 禁用所有工具
                 if self.peak_rect_selector is not None:
                     self.peak_rect_selector.set_active(False)
-                    self.peak_rect_selector = None
-
-            self.peak_canvas.draw_idle()
 
         except Exception as e:
             logger.error(f"切换工具模式出错: {str(e)}")
@@ -4254,7 +4935,7 @@ class SpectralProcessorGUI:
             self.peak_ax.set_xlim(x2, x1)  # 倒置：左大右小
             self.peak_ax.set_ylim(y1, y2)
 
-            self.peak_canvas.draw()
+            self.peak_canvas.draw_idle()
             logger.info(f"矩形选框缩放: X=[{x2:.2f}, {x1:.2f}] (倒置), Y=[{y1:.4f}, {y2:.4f}]")
 
         except Exception as e:
@@ -4264,17 +4945,13 @@ class SpectralProcessorGUI:
         """添加缩放状态到历史记录"""
         try:
             # 删除当前位置之后的所有历史记录
-            self.peak_zoom_history = self.peak_zoom_history[:self.peak_zoom_history_index + 1]
+            while len(self.peak_zoom_history) > self.peak_zoom_history_index + 1:
+                self.peak_zoom_history.pop()
 
-            # 添加新的历史记录
+            # 添加新的历史记录（超过50个时 deque 自动丢弃最早的记录）
             self.peak_zoom_history.append((tuple(xlim), tuple(ylim)))
             self.peak_zoom_history_index = len(self.peak_zoom_history) - 1
 
-            # 限制历史记录数量（最多保留50个）
-            if len(self.peak_zoom_history) > 50:
-                self.peak_zoom_history.pop(0)
-                self.peak_zoom_history_index -= 1
-
             # 更新按钮状态
             self.update_zoom_history_buttons()
 
@@ -4310,7 +4987,7 @@ class SpectralProcessorGUI:
 
                 self.peak_ax.set_xlim(xlim)
                 self.peak_ax.set_ylim(ylim)
-                self.peak_canvas.draw()
+                self.peak_canvas.draw_idle()
 
                 self.update_zoom_history_buttons()
                 logger.info(f"后退到缩放历史: 索引={self.peak_zoom_history_index}")
@@ -4327,7 +5004,7 @@ class SpectralProcessorGUI:
 
                 self.peak_ax.set_xlim(xlim)
                 self.peak_ax.set_ylim(ylim)
-                self.peak_canvas.draw()
+                self.peak_canvas.draw_idle()
 
                 self.update_zoom_history_buttons()
                 logger.info(f"前进到缩放历史: 索引={self.peak_zoom_history_index}")
@@ -4335,6 +5012,27 @@ class SpectralProcessorGUI:
         except Exception as e:
             logger.error(f"前进缩放历史出错: {str(e)}")
 
+    def _get_value_range(self, key, data):
+        """
+        获取数组的最小值和最大值（同一数组只计算一次）
+
+        数据被重新加载或处理后会替换为新的数组对象，缓存随之失效。
+
+        Args:
+            key: 缓存键（'x' 或数据类型）
+            data: 数据数组
+
+        Returns:
+            Tuple[float, float]: (最小值, 最大值)
+        """
+        cached = self._value_range_cache.get(key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        value_range = (float(np.min(data)), float(np.max(data)))
+        self._value_range_cache[key] = (data, value_range)
+        return value_range
+
     def reset_zoom_peak(self):
         """重置峰分析图形到原始视图"""
         try:
@@ -4350,14 +5048,16 @@ class SpectralProcessorGUI:
                 data_type = self.peak_data_var.get()
                 y_data = self.data_manager.get_data(data_type)
                 if y_data is not None:
+                    x_min, x_max = self._get_value_range('x', self.x_data)
+                    y_min, y_max = self._get_value_range(data_type, y_data)
                     # X轴倒置：高波数在左，低波数在右
-                    self.peak_ax.set_xlim(np.max(self.x_data), np.min(self.x_data))
-                    self.peak_ax.set_ylim(np.min(y_data) * 0.95, np.max(y_data) * 1.05)
+                    self.peak_ax.set_xlim(x_max, x_min)
+                    self.peak_ax.set_ylim(y_min * 0.95, y_max * 1.05)
 
             # 添加到历史记录
             self.add_zoom_history(self.peak_ax.get_xlim(), self.peak_ax.get_ylim())
 
-            self.peak_canvas.draw()
+            self.peak_canvas.draw_idle()
             logger.info("峰分析图形重置到原始视图")
         except Exception as e:
             logger.error(f"重置图形出错: {str(e)}")
@@ -4365,24 +5065,45 @@ class SpectralProcessorGUI:
     # ========== 日志管理方法 ==========
 
     def refresh_log(self):
-        """刷新日志显示"""
+        """
+        刷新日志显示
+
+        只读取上次刷新之后新追加的内容，并将其中符合筛选条件的行追加到显示区域；
+        日志文件被截断或替换时从头重新读取。
+        """
         try:
             log_file = os.path.join('logs', 'ftir_processor.log')
 
             if not os.path.exists(log_file):
-                self.log_text.delete('1.0', tk.END)
+                self._reset_log_view()
+                self._log_inode = None
                 self.log_text.insert('1.0', "日志文件不存在")
                 return
 
-            # 读取日志文件
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_content = f.read()
-
-            # 保存所有日志行
-            self.all_log_lines = log_content.split('\n')
-
-            # 应用筛选
-            self.filter_log()
+            # 文件被替换或截断时，重置读取位置并清空显示
+            file_stat = os.stat(log_file)
+            if file_stat.st_ino != self._log_inode or file_stat.st_size < self._log_offset:
+                self._log_inode = file_stat.st_ino
+                self._reset_log_view()
+
+            # 只读取新追加的完整行，未写完的最后一行留到下次刷新
+            # 使用 mmap 直接在页缓存中查找行尾，不读入未完成的部分
+            new_bytes = b''
+            if file_stat.st_size > self._log_offset:
+                with open(log_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = mm.rfind(b'\n', self._log_offset) + 1
+                    if end > 0:
+                        new_bytes = mm[self._log_offset:end]
+
+            if new_bytes:
+                new_lines = new_bytes.decode('utf-8', errors='replace').splitlines()
+                self._log_offset += len(new_bytes)
+
+                # 保存日志行，并只追加新行中符合筛选条件的部分
+                self.all_log_lines.extend(new_lines)
+                self._append_log_lines(self._filter_log_lines(new_lines))
+                self.log_text.see(tk.END)
 
             logger.info("日志已刷新")
 
@@ -4393,28 +5114,15 @@ class SpectralProcessorGUI:
     def filter_log(self):
         """根据级别和搜索关键词筛选日志"""
         try:
-            if not hasattr(self, 'all_log_lines'):
-                return
-
-            level_filter = self.log_level_var.get()
-            search_text = self.log_search_var.get().lower()
+            self._filtered_log_lines = self._filter_log_lines(self.all_log_lines)
+            self._log_display_limit = self.LOG_MAX_DISPLAY_LINES
 
-            # 清空显示
+            # 清空显示，只插入最新的部分日志行
             self.log_text.delete('1.0', tk.END)
-
-            # 筛选日志行
-            for line in self.all_log_lines:
-                # 级别筛选
-                if level_filter != "全部":
-                    if f" - {level_filter} - " not in line:
-                        continue
-
-                # 搜索筛选
-                if search_text and search_text not in line.lower():
-                    continue
-
-                # 插入日志行并设置颜色
-                self.insert_log_line(line)
+            visible_lines = self._filtered_log_lines[-self._log_display_limit:]
+            self.insert_log_lines(visible_lines)
+            self._log_display_count = len(visible_lines)
+            self._update_log_load_more_state()
 
             # 滚动到底部
             self.log_text.see(tk.END)
@@ -4422,25 +5130,127 @@ class SpectralProcessorGUI:
         except Exception as e:
             logger.error(f"筛选日志失败: {str(e)}")
 
+    def _reset_log_view(self):
+        """清空日志显示和已读取的日志行，下次刷新时从文件开头读取"""
+        self.log_text.delete('1.0', tk.END)
+        self.all_log_lines = []
+        self._filtered_log_lines = []
+        self._log_display_count = 0
+        self._log_display_limit = self.LOG_MAX_DISPLAY_LINES
+        self._log_offset = 0
+        self._update_log_load_more_state()
+
+    def _append_log_lines(self, lines):
+        """
+        在日志显示区域末尾追加已筛选的日志行，超出显示上限时删除最早的行
+
+        Args:
+            lines: 符合当前筛选条件的日志行列表
+        """
+        if not lines:
+            return
+
+        self._filtered_log_lines.extend(lines)
+        self.insert_log_lines(lines)
+        self._log_display_count += len(lines)
+
+        excess = self._log_display_count - self._log_display_limit
+        if excess > 0:
+            self.log_text.delete('1.0', f'{excess + 1}.0')
+            self._log_display_count = self._log_display_limit
+        self._update_log_load_more_state()
+
+    def load_more_log(self):
+        """在日志显示区域顶部加载更早的日志行"""
+        try:
+            hidden_count = len(self._filtered_log_lines) - self._log_display_count
+            if hidden_count <= 0:
+                return
+
+            load_count = min(self.LOG_MAX_DISPLAY_LINES, hidden_count)
+            self.insert_log_lines(self._filtered_log_lines[hidden_count - load_count:hidden_count], '1.0')
+            self._log_display_count += load_count
+            self._log_display_limit += load_count
+            self._update_log_load_more_state()
+
+            # 定位到新加载部分与原有内容的衔接处
+            self.log_text.see(f'{load_count + 1}.0')
+
+        except Exception as e:
+            logger.error(f"加载更早日志失败: {str(e)}")
+
+    def _update_log_load_more_state(self):
+        """根据是否还有未显示的日志行更新"加载更早日志"按钮状态"""
+        if not hasattr(self, 'log_load_more_btn'):
+            return
+        hidden_count = len(self._filtered_log_lines) - self._log_display_count
+        self.log_load_more_btn.config(state='normal' if hidden_count > 0 else 'disabled')
+
+    def _filter_log_lines(self, lines):
+        """
+        按当前的级别和搜索关键词筛选日志行
+
+        Args:
+            lines: 待筛选的日志行列表
+
+        Returns:
+            list: 符合条件的日志行
+        """
+        level_filter = self.log_level_var.get()
+        search_text = self.log_search_var.get()
+
+        filtered_lines = lines
+
+        # 级别筛选
+        if level_filter != "全部":
+            level_token = f" - {level_filter} - "
+            filtered_lines = [line for line in filtered_lines if level_token in line]
+
+        # 搜索筛选（忽略大小写的预编译正则，避免逐行 lower() 产生临时字符串）
+        if search_text:
+            search_pattern = re.compile(re.escape(search_text), re.IGNORECASE)
+            filtered_lines = list(filter(search_pattern.search, filtered_lines))
+
+        # 未筛选时返回副本，避免调用方修改结果时影响原列表
+        if filtered_lines is lines:
+            filtered_lines = list(lines)
+        return filtered_lines
+
+    def _get_log_line_tag(self, line):
+        """获取日志行对应的颜色标签，无法识别级别时返回None"""
+        match = self.LOG_LEVEL_PATTERN.search(line)
+        return self.LOG_LEVEL_TAGS.get(match.group(1)) if match else None
+
     def insert_log_line(self, line):
         """插入日志行并设置颜色"""
-        if not line.strip():
-            self.log_text.insert(tk.END, line + '\n')
-            return
+        self.insert_log_lines([line])
 
-        # 检测日志级别并设置颜色
-        if ' - DEBUG - ' in line:
-            self.log_text.insert(tk.END, line + '\n', 'DEBUG')
-        elif ' - INFO - ' in line:
-            self.log_text.insert(tk.END, line + '\n', 'INFO')
-        elif ' - WARNING - ' in line:
-            self.log_text.insert(tk.END, line + '\n', 'WARNING')
-        elif ' - ERROR - ' in line:
-            self.log_text.insert(tk.END, line + '\n', 'ERROR')
-        elif ' - CRITICAL - ' in line:
-            self.log_text.insert(tk.END, line + '\n', 'CRITICAL')
-        else:
-            self.log_text.insert(tk.END, line + '\n')
+    def insert_log_lines(self, lines, index=tk.END):
+        """
+        批量插入日志行并设置颜色
+
+        将级别相同的连续行合并为一段，所有段通过一次 Text.insert 调用插入，
+        避免逐行跨越 Python/Tcl 边界并反复触发布局计算，同时保持行的原始顺序。
+
+        Args:
+            lines: 日志行列表
+            index: 插入位置，默认为末尾
+        """
+        segments = []
+        run = []
+        run_tag = None
+        for line in lines:
+            tag = self._get_log_line_tag(line)
+            if run and tag != run_tag:
+                segments.extend(('\n'.join(run) + '\n', run_tag or ()))
+                run = []
+            run_tag = tag
+            run.append(line)
+        if run:
+            segments.extend(('\n'.join(run) + '\n', run_tag or ()))
+
+        if segments:
+            self.log_text.insert(index, *segments)
 
     def clear_log(self):
         """清空日志文件"""
@@ -4459,12 +5269,10 @@ class SpectralProcessorGUI:
 
             if os.path.exists(log_file):
                 # 清空文件内容
-                with open(log_file, 'w', encoding='utf-8') as f:
-                    f.write('')
+                self._truncate_log_file(log_file)
 
                 # 刷新显示
-                self.log_text.delete('1.0', tk.END)
-                self.all_log_lines = []
+                self._reset_log_view()
 
                 messagebox.showinfo("成功", "日志已清空")
                 logger.info("日志文件已清空")
@@ -4475,6 +5283,33 @@ class SpectralProcessorGUI:
             messagebox.showerror("错误", f"清空日志失败：{str(e)}")
             logger.error(f"清空日志失败: {str(e)}")
 
+    @staticmethod
+    def _truncate_log_file(log_file):
+        """
+        清空日志文件内容
+
+        优先通过正在写入该文件的 FileHandler 的文件流截断（持有处理器锁，
+        不会与日志写入冲突，也不需要在 Windows 上重新打开被占用的文件）；
+        找不到对应的处理器时直接截断文件。
+
+        Args:
+            log_file: 日志文件路径
+        """
+        log_path = os.path.abspath(log_file)
+        for handler in logging.getLogger().handlers:
+            if (isinstance(handler, logging.FileHandler) and
+                    handler.baseFilename == log_path and handler.stream is not None):
+                handler.acquire()
+                try:
+                    handler.stream.flush()
+                    handler.stream.seek(0)
+                    handler.stream.truncate()
+                finally:
+                    handler.release()
+                return
+
+        os.truncate(log_file, 0)
+
     def export_log(self):
         """导出日志到文件"""
         try:
@@ -4486,7 +5321,6 @@ class SpectralProcessorGUI:
                 return
 
             # 选择保存位置
-            from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             default_filename = f"ftir_log_{timestamp}.txt"
 
@@ -4523,7 +5357,7 @@ class SpectralProcessorGUI:
 
         try:
             # 获取记录信息
-            values = self.result_tree.item(item, 'values')
+            values = self._result_rows.get(item)
             if not values:
                 return
 
@@ -4563,6 +5397,40 @@ class SpectralProcessorGUI:
         finally:
             context_menu.grab_release()
 
+    def _delete_result_row(self, item):
+        """
+        从结果表格中删除一行，并同步更新行数据缓存和峰编号索引
+
+        Args:
+            item: Treeview中的项目ID
+        """
+        self.result_tree.delete(item)
+        values = self._result_rows.pop(item, None)
+        if values is not None:
+            self._peak_plot_version += 1
+            peak_number = int(values[1])
+            iids = self._result_iids_by_peak.get(peak_number)
+            if iids is not None:
+                iids.remove(item)
+                if not iids:
+                    del self._result_iids_by_peak[peak_number]
+
+    def _clear_peak_range_inputs(self):
+        """
+        清空峰分析的上下限输入框
+
+        只清空有值的输入框，避免写入相同的空值触发 trace 回调而重绘图形。
+
+        Returns:
+            bool: 是否清空了至少一个输入框
+        """
+        cleared = False
+        for var in (self.peak_lower_var, self.peak_upper_var):
+            if var.get():
+                var.set("")
+                cleared = True
+        return cleared
+
     def delete_result_record(self, item):
         """
         删除峰分析结果列表中的指定记录
@@ -4572,7 +5440,7 @@ class SpectralProcessorGUI:
         """
         try:
             # 获取记录信息
-            values = self.result_tree.item(item, 'values')
+            values = self._result_rows.get(item)
             if not values:
                 return
 
@@ -4590,35 +5458,18 @@ class SpectralProcessorGUI:
                                       f"区间: {lower_limit:.2f} - {upper_limit:.2f}"):
                 return
 
-            # 从结果列表中删除
-            self.result_tree.delete(item)
-
-            # 从 analyzed_ranges 中删除对应的区间（兼容三元组和四元组格式）
-            if hasattr(self, 'analyzed_ranges'):
-                original_count = len(self.analyzed_ranges)
-                # 查找并删除匹配的区间
-                new_ranges = []
-                for range_data in self.analyzed_ranges:
-                    # 兼容旧格式（三元组）和新格式（四元组）
-                    if len(range_data) == 3:
-                        lower, upper, num = range_data
-                        fname = None
-                    elif len(range_data) == 4:
-                        lower, upper, num, fname = range_data
-                    else:
-                        continue
+            plot_version = self._peak_plot_version
 
-                    # 检查是否匹配（需要同时匹配区间、峰编号和文件名）
-                    is_match = (abs(lower - lower_limit) < 0.01 and
-                               abs(upper - upper_limit) < 0.01 and
-                               num == peak_number and
-                               (fname is None or fname == file_name))
-
-                    if not is_match:
-                        new_ranges.append(range_data)
+            # 从结果列表中删除
+            self._delete_result_row(item)
 
-                self.analyzed_ranges = new_ranges
-                logger.info(f"从 analyzed_ranges 删除区间: 原有{original_count}个，现有{len(self.analyzed_ranges)}个")
+            # 从 analyzed_ranges 中删除对应的区间（需要同时匹配区间、峰编号和文件名）
+            original_count = len(self.analyzed_ranges)
+            matches = self._find_analyzed_ranges(
+                lower_limit, upper_limit, peak_number,
+                lambda fname: fname is None or fname == file_name)
+            range_ids = self._remove_analyzed_ranges(matches)
+            logger.info(f"从 analyzed_ranges 删除区间: 原有{original_count}个，现有{len(self.analyzed_ranges)}个")
 
             # 【修复】检查输入框的值是否与删除的记录匹配，如果匹配则清空输入框
             # 这样可以避免删除记录后仍然显示黄色预览区域
@@ -4632,23 +5483,23 @@ class SpectralProcessorGUI:
                         abs(current_lower - lower_limit) < 0.01 and
                         abs(current_upper - upper_limit) < 0.01):
                         # 输入框的值与删除的记录匹配，清空输入框
-                        self.peak_lower_var.set("")
-                        self.peak_upper_var.set("")
+                        self._clear_peak_range_inputs()
                         logger.info(f"删除记录后，已清空匹配的输入框值: {lower_limit:.2f}-{upper_limit:.2f}")
                 except ValueError:
                     pass  # 输入框的值无效，忽略
 
             # 【修复】如果删除后结果表格为空，也清空输入框（避免显示黄色预览区域）
-            if len(self.result_tree.get_children()) == 0:
+            if not self._result_rows:
                 if hasattr(self, 'peak_lower_var') and hasattr(self, 'peak_upper_var'):
-                    self.peak_lower_var.set("")
-                    self.peak_upper_var.set("")
-                    logger.info("删除最后一条记录后，已清空峰分析区域的上下限输入框")
-
-            # 重新绘制图形（移除区间标记）
-            if hasattr(self, 'peak_ax') and self.peak_ax is not None:
-                logger.info("调用 update_peak_plot() 重新绘制图形")
-                self.update_peak_plot()
+                    if self._clear_peak_range_inputs():
+                        logger.info("删除最后一条记录后，已清空峰分析区域的上下限输入框")
+
+            # 从图形中移除区间标记（没有实际删除任何内容时无需更新；图形对象记录失效时才重新绘制整个图形）
+            if (self._peak_plot_version != plot_version and
+                    hasattr(self, 'peak_ax') and self.peak_ax is not None):
+                if not self.remove_analyzed_ranges_from_plot(range_ids):
+                    logger.info("调用 update_peak_plot() 重新绘制图形")
+                    self.update_peak_plot()
 
             logger.info(f"已删除峰分析记录: 文件={file_name}, 峰编号={peak_number}, 区间={lower_limit:.2f}-{upper_limit:.2f}")
 
@@ -4656,6 +5507,133 @@ class SpectralProcessorGUI:
             messagebox.showerror("错误", f"删除记录失败：{str(e)}")
             logger.error(f"删除峰分析记录失败: {str(e)}")
 
+    @staticmethod
+    def _range_key(lower, upper, peak_number):
+        """生成已分析区间索引的键（区间端点按 0.01 精度取整）"""
+        return (int(round(lower * 100)), int(round(upper * 100)), peak_number)
+
+    def _add_analyzed_range(self, range_data):
+        """
+        记录已分析区间，并同步更新区间索引
+
+        Args:
+            range_data: 区间元组 (lower, upper, peak_number, file_name)
+
+        Returns:
+            int: 区间编号（单调递增，不会与已删除的区间重复）
+        """
+        self.analyzed_ranges.append(range_data)
+        range_id = self._range_seq
+        self._range_ids[id(range_data)] = range_id
+
+        lower, upper, peak_number = range_data[:3]
+        self._range_index[self._range_key(lower, upper, peak_number)].append(range_data)
+
+        # 考虑x轴可能倒置的情况，按左端点有序插入
+        low, high = min(lower, upper), max(lower, upper)
+        pos = bisect.bisect_right(self._range_lows, low)
+        self._range_lows.insert(pos, low)
+        self._range_sorted.insert(pos, (high, self._range_seq, range_data))
+        self._range_seq += 1
+        self._range_max_width = max(self._range_max_width, high - low)
+        self._peak_plot_version += 1
+        return range_id
+
+    def _find_analyzed_ranges(self, lower, upper, peak_number, file_filter):
+        """
+        查找与给定区间匹配的已分析区间（端点容差 0.01）
+
+        Args:
+            lower: 区间下限
+            upper: 区间上限
+            peak_number: 峰编号
+            file_filter: 文件名判断函数，参数为区间记录的文件名（旧格式为 None）
+
+        Returns:
+            list: 匹配的区间元组列表
+        """
+        key_lower, key_upper, _ = self._range_key(lower, upper, peak_number)
+        matches = []
+        # 容差 0.01 内的端点取整后最多相差 1，只需检查相邻的键
+        for dl in (-1, 0, 1):
+            for du in (-1, 0, 1):
+                for range_data in self._range_index.get((key_lower + dl, key_upper + du, peak_number), ()):
+                    l, u = range_data[0], range_data[1]
+                    fname = range_data[3] if len(range_data) == 4 else None
+                    if abs(l - lower) < 0.01 and abs(u - upper) < 0.01 and file_filter(fname):
+                        matches.append(range_data)
+        return matches
+
+    def _remove_analyzed_ranges(self, matches):
+        """
+        删除已分析区间，并同步更新区间索引
+
+        Args:
+            matches: 要删除的区间元组列表（由 _find_analyzed_ranges 返回）
+
+        Returns:
+            list: 已删除区间的编号列表
+        """
+        if not matches:
+            return []
+        self._peak_plot_version += 1
+        range_ids = [self._range_ids.pop(id(range_data)) for range_data in matches]
+
+        removed_ids = {id(range_data) for range_data in matches}
+        self.analyzed_ranges = [r for r in self.analyzed_ranges if id(r) not in removed_ids]
+
+        for range_data in matches:
+            lower, upper, peak_number = range_data[:3]
+            key = self._range_key(lower, upper, peak_number)
+            bucket = [r for r in self._range_index.get(key, ()) if r is not range_data]
+            if bucket:
+                self._range_index[key] = bucket
+            else:
+                self._range_index.pop(key, None)
+
+            low = min(lower, upper)
+            start = bisect.bisect_left(self._range_lows, low)
+            end = bisect.bisect_right(self._range_lows, low)
+            for i in range(start, end):
+                if self._range_sorted[i][2] is range_data:
+                    del self._range_lows[i]
+                    del self._range_sorted[i]
+                    break
+        return range_ids
+
+    def _clear_analyzed_ranges(self):
+        """清空已分析区间及其索引"""
+        self.analyzed_ranges.clear()
+        self._range_ids.clear()
+        self._range_index.clear()
+        self._range_lows.clear()
+        self._range_sorted.clear()
+        self._range_max_width = 0.0
+        self._peak_plot_version += 1
+
+    def _find_range_at(self, x):
+        """
+        查找包含指定波数的已分析区间
+
+        Args:
+            x: 波数
+
+        Returns:
+            tuple: 最早添加的包含该波数的区间元组，不存在时返回 None
+        """
+        # 只需检查左端点在 [x - 最大宽度, x] 内的区间
+        pos = bisect.bisect_right(self._range_lows, x)
+        start = bisect.bisect_left(self._range_lows, x - self._range_max_width, 0, pos)
+        found = None
+        for high, seq, range_data in self._range_sorted[start:pos]:
+            if x <= high and (found is None or seq < found[0]):
+                found = (seq, range_data)
+        return found[1] if found else None
+
+    def _invalidate_peak_canvas_root_xy(self, event=None):
+        """窗口移动或尺寸变化时清除缓存的画布屏幕坐标"""
+        self._peak_canvas_root_xy = None
+
     def on_peak_plot_right_click(self, event):
         """
         处理图形区域的右键点击事件
@@ -4668,23 +5646,13 @@ class SpectralProcessorGUI:
 
         click_x = event.xdata
 
-        # 检查是否点击在某个已分析的区间内
+        # 检查是否点击在某个已分析的区间内（兼容旧格式三元组和新格式四元组）
         clicked_range = None
-        if hasattr(self, 'analyzed_ranges'):
-            for range_data in self.analyzed_ranges:
-                # 兼容旧格式（三元组）和新格式（四元组）
-                if len(range_data) == 3:
-                    lower, upper, peak_number = range_data
-                    file_name = None
-                elif len(range_data) == 4:
-                    lower, upper, peak_number, file_name = range_data
-                else:
-                    continue
-
-                # 考虑x轴可能倒置的情况
-                if min(lower, upper) <= click_x <= max(lower, upper):
-                    clicked_range = (lower, upper, peak_number, file_name)
-                    break
+        range_data = self._find_range_at(click_x)
+        if range_data is not None:
+            lower, upper, peak_number = range_data[:3]
+            file_name = range_data[3] if len(range_data) == 4 else None
+            clicked_range = (lower, upper, peak_number, file_name)
 
         # 检查是否有当前选择的区间（但未分析）
         has_current_selection = False
@@ -4726,9 +5694,12 @@ class SpectralProcessorGUI:
         # 显示菜单
         try:
             # 将matplotlib坐标转换为屏幕坐标
-            canvas = self.peak_canvas.get_tk_widget()
-            x_screen = canvas.winfo_rootx() + int(event.x)
-            y_screen = canvas.winfo_rooty() + int(event.y)
+            if self._peak_canvas_root_xy is None:
+                canvas = self.peak_canvas.get_tk_widget()
+                self._peak_canvas_root_xy = (canvas.winfo_rootx(), canvas.winfo_rooty())
+            root_x, root_y = self._peak_canvas_root_xy
+            x_screen = root_x + int(event.x)
+            y_screen = root_y + int(event.y)
             context_menu.tk_popup(x_screen, y_screen)
         finally:
             context_menu.grab_release()
@@ -4751,48 +5722,29 @@ class SpectralProcessorGUI:
                                       f"区间: {lower:.2f} - {upper:.2f}"):
                 return
 
-            # 从 analyzed_ranges 中删除（兼容三元组和四元组格式）
-            if hasattr(self, 'analyzed_ranges'):
-                original_count = len(self.analyzed_ranges)
-                new_ranges = []
-                for range_data in self.analyzed_ranges:
-                    # 兼容旧格式（三元组）和新格式（四元组）
-                    if len(range_data) == 3:
-                        l, u, n = range_data
-                        fname = None
-                    elif len(range_data) == 4:
-                        l, u, n, fname = range_data
-                    else:
-                        continue
-
-                    # 检查是否匹配
-                    is_match = (abs(l - lower) < 0.01 and
-                               abs(u - upper) < 0.01 and
-                               n == peak_number and
-                               (file_name is None or fname is None or fname == file_name))
+            plot_version = self._peak_plot_version
 
-                    if not is_match:
-                        new_ranges.append(range_data)
-
-                self.analyzed_ranges = new_ranges
-                logger.info(f"从 analyzed_ranges 删除区间: 原有{original_count}个，现有{len(self.analyzed_ranges)}个")
+            # 从 analyzed_ranges 中删除
+            original_count = len(self.analyzed_ranges)
+            matches = self._find_analyzed_ranges(
+                lower, upper, peak_number,
+                lambda fname: file_name is None or fname is None or fname == file_name)
+            range_ids = self._remove_analyzed_ranges(matches)
+            logger.info(f"从 analyzed_ranges 删除区间: 原有{original_count}个，现有{len(self.analyzed_ranges)}个")
 
             # 从结果列表中删除对应的记录
             deleted_from_tree = False
-            for item in self.result_tree.get_children():
-                values = self.result_tree.item(item, 'values')
-                if values:
-                    item_peak_number = int(values[1])
-                    item_lower = float(values[5])
-                    item_upper = float(values[6])
-
-                    if (item_peak_number == peak_number and
-                        abs(item_lower - lower) < 0.01 and
-                        abs(item_upper - upper) < 0.01):
-                        self.result_tree.delete(item)
-                        deleted_from_tree = True
-                        logger.info(f"从结果列表删除记录: 峰#{peak_number}")
-                        break
+            # 只需检查峰编号相同的记录
+            for item in self._result_iids_by_peak.get(peak_number, ()):
+                values = self._result_rows[item]
+                item_lower = float(values[5])
+                item_upper = float(values[6])
+
+                if abs(item_lower - lower) < 0.01 and abs(item_upper - upper) < 0.01:
+                    self._delete_result_row(item)
+                    deleted_from_tree = True
+                    logger.info(f"从结果列表删除记录: 峰#{peak_number}")
+                    break
 
             if not deleted_from_tree:
                 logger.warning(f"未在结果列表中找到匹配的记录: 峰#{peak_number}")
@@ -4809,23 +5761,23 @@ class SpectralProcessorGUI:
                         abs(current_lower - lower) < 0.01 and
                         abs(current_upper - upper) < 0.01):
                         # 输入框的值与删除的记录匹配，清空输入框
-                        self.peak_lower_var.set("")
-                        self.peak_upper_var.set("")
+                        self._clear_peak_range_inputs()
                         logger.info(f"删除记录后，已清空匹配的输入框值: {lower:.2f}-{upper:.2f}")
                 except ValueError:
                     pass  # 输入框的值无效，忽略
 
             # 【修复】如果删除后结果表格为空，也清空输入框（避免显示黄色预览区域）
-            if len(self.result_tree.get_children()) == 0:
+            if not self._result_rows:
                 if hasattr(self, 'peak_lower_var') and hasattr(self, 'peak_upper_var'):
-                    self.peak_lower_var.set("")
-                    self.peak_upper_var.set("")
-                    logger.info("删除最后一条记录后，已清空峰分析区域的上下限输入框")
-
-            # 重新绘制图形
-            if hasattr(self, 'peak_ax') and self.peak_ax is not None:
-                logger.info("调用 update_peak_plot() 重新绘制图形")
-                self.update_peak_plot()
+                    if self._clear_peak_range_inputs():
+                        logger.info("删除最后一条记录后，已清空峰分析区域的上下限输入框")
+
+            # 从图形中移除区间标记（没有实际删除任何内容时无需更新；图形对象记录失效时才重新绘制整个图形）
+            if (self._peak_plot_version != plot_version and
+                    hasattr(self, 'peak_ax') and self.peak_ax is not None):
+                if not self.remove_analyzed_ranges_from_plot(range_ids):
+                    logger.info("调用 update_peak_plot() 重新绘制图形")
+                    self.update_peak_plot()
 
             logger.info(f"已从图形中删除区间分析: 峰编号={peak_number}, 区间={lower:.2f}-{upper:.2f}")
 
@@ -4887,5 +5839,15 @@ def main():
     logger.info("应用程序启动")
     root.mainloop()
 
+    # 【修复】文件导出任务必须写完，不能随进程一起结束
+    concurrent.futures.wait(list(app._export_futures))
+
+    # 线程池的工作线程不是守护线程，解释器退出时会等待正在执行的任务；
+    # 关闭窗口时若仍有计算在进行（如耗时的LOWESS），直接结束进程，避免程序残留在后台
+    if app.has_running_background_task():
+        logger.info("关闭时仍有后台计算在进行，直接结束进程")
+        logging.shutdown()
+        os._exit(0)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,6 +7,7 @@
 import numpy as np
 from pybaselines import Baseline
 import logging
+from collections import OrderedDict
 from typing import Tuple
 
 logger = logging.getLogger(__name__)
@@ -24,11 +25,39 @@ class BaselineCorrector:
     - Mixture Model（混合模型/平滑样条）
     """
     
+    # 校正结果缓存的最大条目数
+    RESULT_CACHE_SIZE = 8
+    
     def __init__(self):
         """初始化基线校正器"""
         self.baseline_fitter = Baseline()
+        self._fitter_x_data = None  # 当前 baseline_fitter 绑定的X轴数据
+        self._result_cache = OrderedDict()  # (方法, 参数, Y轴数据标识) -> (Y轴数据, 校正后的数据, 基线)，仅对应当前X轴
         logger.info("基线校正器初始化完成")
     
+    def _get_fitter(self, x_data: np.ndarray) -> Baseline:
+        """
+        获取绑定到指定X轴数据的基线拟合器
+        
+        X轴数据不变时复用同一个 Baseline 对象，pybaselines 可沿用已归一化的X轴，
+        只有加载新数据（X轴数组更换）时才重新创建。多项式阶数不变时，
+        modpoly/imodpoly 的范德蒙矩阵及其伪逆也随之缓存，迭代和重复校正都不再重新分解。
+        
+        拟合器仍按数据点序号建立（与不传 x_data 时 pybaselines 使用的 linspace(-1, 1, n) 相同），
+        而不是按实际波数：波数间隔不均匀时两者的基线不同，这里保持原有的校正结果不变。
+        
+        Args:
+            x_data: X轴数据
+            
+        Returns:
+            Baseline: 基线拟合器
+        """
+        if x_data is not self._fitter_x_data:
+            self.baseline_fitter = Baseline(x_data=np.linspace(-1, 1, len(x_data)))
+            self._fitter_x_data = x_data
+            self._result_cache.clear()
+        return self.baseline_fitter
+    
     @staticmethod
     def validate_positive_int(value: int, param_name: str, min_value: int = 1) -> Tuple[bool, str]:
         """
@@ -75,7 +104,7 @@ class BaselineCorrector:
             Tuple[bool, np.ndarray, np.ndarray, str]: (是否成功, 校正后的数据, 基线, 错误消息)
         """
         try:
-            baseline, params = self.baseline_fitter.rubberband(y_data)
+            baseline, params = self._get_fitter(x_data).rubberband(y_data)
             corrected = y_data - baseline
             logger.info("Rubberband基线校正完成")
             return True, corrected, baseline, ""
@@ -104,7 +133,7 @@ class BaselineCorrector:
                 logger.error(f"ModPoly参数验证失败: {error_msg}")
                 return False, y_data, np.zeros_like(y_data), error_msg
             
-            baseline, params = self.baseline_fitter.modpoly(y_data, poly_order)
+            baseline, params = self._get_fitter(x_data).modpoly(y_data, poly_order)
             corrected = y_data - baseline
             logger.info(f"ModPoly基线校正完成: poly_order={poly_order}")
             return True, corrected, baseline, ""
@@ -139,7 +168,7 @@ class BaselineCorrector:
                 logger.error(f"IModPoly参数验证失败: {error_msg}")
                 return False, y_data, np.zeros_like(y_data), error_msg
             
-            baseline, params = self.baseline_fitter.imodpoly(
+            baseline, params = self._get_fitter(x_data).imodpoly(
                 y_data, poly_order, max_iter=max_iter)
             corrected = y_data - baseline
             logger.info(f"IModPoly基线校正完成: poly_order={poly_order}, max_iter={max_iter}")
@@ -175,7 +204,8 @@ class BaselineCorrector:
                 logger.error(error_msg)
                 return False, y_data, np.zeros_like(y_data), error_msg
             
-            baseline, params = self.baseline_fitter.asls(y_data, lam=lam, p=p)
+            # pybaselines 以带状矩阵求解 W + λDᵀD（每次迭代 O(N)），无需另行做稀疏分解
+            baseline, params = self._get_fitter(x_data).asls(y_data, lam=lam, p=p)
             corrected = y_data - baseline
             logger.info(f"ASLS基线校正完成: lam={lam}, p={p}")
             return True, corrected, baseline, ""
@@ -209,7 +239,7 @@ class BaselineCorrector:
                 logger.error(error_msg)
                 return False, y_data, np.zeros_like(y_data), error_msg
             
-            baseline, params = self.baseline_fitter.mixture_model(
+            baseline, params = self._get_fitter(x_data).mixture_model(
                 y_data, num_knots=num_knots)
             corrected = y_data - baseline
             logger.info(f"Mixture Model基线校正完成: num_knots={num_knots}")
@@ -240,33 +270,55 @@ class BaselineCorrector:
                 logger.error(error_msg)
                 return False, y_data, np.zeros_like(y_data), error_msg
             
-            if np.any(np.isnan(y_data)) or np.any(np.isinf(y_data)):
+            if not np.isfinite(y_data).all():
                 error_msg = "数据包含无效值（NaN或Inf）"
                 logger.error(error_msg)
                 return False, y_data, np.zeros_like(y_data), error_msg
             
             logger.info(f"开始基线校正，方法: {method}")
             
+            # 同一X轴上以相同方法和参数校正过同一数组时直接返回缓存结果
+            # 【修复】与 _get_fitter 一样按对象标识识别Y轴数据，不再每次复制整条光谱求哈希；
+            # 附带形状、类型和抽样校验值，数组被原地修改时不会误命中
+            step = max(1, y_data.size // 64)
+            fingerprint = (y_data.shape, y_data.dtype.str, float(y_data.sum()), y_data[::step].tobytes())
+            cache_key = (method, tuple(sorted(params.items())), id(y_data), fingerprint)
+            cached = self._result_cache.get(cache_key) if x_data is self._fitter_x_data else None
+            # 缓存条目持有Y轴数组的引用，其id不会被其他对象复用；仍核对一次对象标识
+            if cached is not None and cached[0] is y_data:
+                self._result_cache.move_to_end(cache_key)
+                _, corrected, baseline = cached
+                logger.info(f"基线校正使用缓存结果，方法: {method}")
+                return True, corrected.copy(), baseline.copy(), ""
+            
             # 根据方法选择校正算法
             if method == "rubberband":
-                return self.correct_rubberband(x_data, y_data)
+                result = self.correct_rubberband(x_data, y_data)
             elif method == "modpoly":
-                return self.correct_modpoly(x_data, y_data, params.get('poly_order', 2))
+                result = self.correct_modpoly(x_data, y_data, params.get('poly_order', 2))
             elif method == "imodpoly":
-                return self.correct_imodpoly(x_data, y_data, 
-                                            params.get('poly_order', 2),
-                                            params.get('max_iter', 50))
+                result = self.correct_imodpoly(x_data, y_data, 
+                                              params.get('poly_order', 2),
+                                              params.get('max_iter', 50))
             elif method == "asls":
-                return self.correct_asls(x_data, y_data,
-                                        params.get('lam', 1e6),
-                                        params.get('p', 0.01))
+                result = self.correct_asls(x_data, y_data,
+                                          params.get('lam', 1e6),
+                                          params.get('p', 0.01))
             elif method == "mixture_model":
-                return self.correct_mixture_model(x_data, y_data,
-                                                  params.get('num_knots', 10))
+                result = self.correct_mixture_model(x_data, y_data,
+                                                    params.get('num_knots', 10))
             else:
                 error_msg = f"未知的基线校正方法: {method}"
                 logger.error(error_msg)
                 return False, y_data, np.zeros_like(y_data), error_msg
+            
+            # 缓存副本，调用方修改返回的数组不会影响缓存
+            success, corrected, baseline, _ = result
+            if success and x_data is self._fitter_x_data:
+                self._result_cache[cache_key] = (y_data, corrected.copy(), baseline.copy())
+                if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            return result
                 
         except Exception as e:
             error_msg = f"基线校正失败: {str(e)}"
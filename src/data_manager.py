@@ -4,6 +4,7 @@
 负责FTIR光谱数据的加载、存储、验证和导出。
 """
 
+import csv
 import numpy as np
 import pandas as pd
 import logging
@@ -25,6 +26,9 @@ class DataManager:
         corrected_data: 基线校正后的数据
     """
     
+    # 导出CSV时每次转换并写入的行数
+    EXPORT_CHUNK_ROWS = 65536
+    
     def __init__(self):
         """初始化数据管理器"""
         self.x_data: Optional[np.ndarray] = None
@@ -45,22 +49,21 @@ class DataManager:
         """
         try:
             logger.info(f"正在加载文件: {file_path}")
-            data = pd.read_csv(file_path)
+            column_count, columns = self.read_spectrum_columns(file_path)
             
             # 验证数据格式
-            if len(data.columns) < 2:
-                error_msg = f"数据文件列数不足: {len(data.columns)}，需要至少两列数据"
+            if columns is None:
+                error_msg = f"数据文件列数不足: {column_count}，需要至少两列数据"
                 logger.error(error_msg)
                 return False, error_msg
             
-            if len(data) == 0:
+            if len(columns[0]) == 0:
                 error_msg = "数据文件为空"
                 logger.error(error_msg)
                 return False, error_msg
             
             # 提取数据
-            self.x_data = data.iloc[:, 0].values
-            self.y_data = data.iloc[:, 1].values
+            self.x_data, self.y_data = columns
             
             # 验证数据有效性
             valid, error_msg = self._validate_data(self.x_data, self.y_data)
@@ -102,6 +105,32 @@ class DataManager:
             logger.exception(error_msg)
             return False, error_msg
     
+    @staticmethod
+    def read_spectrum_columns(file_path: str) -> Tuple[int, Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        读取CSV文件的前两列（波数和强度）
+        
+        先只读表头确认列数，再用C解析器只解析前两列并直接转换为float64，
+        避免解析多余的列和推断列类型，读取后立即释放DataFrame。
+        数据保持float64：导出的CSV需与原始数值一致，float32 会改变导出结果的有效数字。
+        
+        Args:
+            file_path: CSV文件路径
+            
+        Returns:
+            Tuple[int, Optional[Tuple[np.ndarray, np.ndarray]]]: (文件列数, (X轴数据, Y轴数据))；
+            列数不足两列时第二项为None
+        """
+        column_count = len(pd.read_csv(file_path, nrows=0).columns)
+        if column_count < 2:
+            return column_count, None
+        
+        data = pd.read_csv(file_path, usecols=[0, 1], dtype=np.float64, engine='c')
+        x_data = np.ascontiguousarray(data.iloc[:, 0].to_numpy())
+        y_data = np.ascontiguousarray(data.iloc[:, 1].to_numpy())
+        del data
+        return column_count, (x_data, y_data)
+    
     def _validate_data(self, x_data: np.ndarray, y_data: np.ndarray) -> Tuple[bool, str]:
         """
         验证数据有效性
@@ -113,19 +142,20 @@ class DataManager:
         Returns:
             Tuple[bool, str]: (是否有效, 错误消息)
         """
+        # 有效数据只需一次 isfinite 扫描；只有出现无效值时才再区分NaN和Inf，以给出具体的错误消息
+        if np.isfinite(x_data).all() and np.isfinite(y_data).all():
+            return True, ""
+        
         # 检查NaN值
-        if np.any(np.isnan(x_data)) or np.any(np.isnan(y_data)):
+        if np.isnan(x_data).any() or np.isnan(y_data).any():
             error_msg = "数据包含无效值（NaN）"
             logger.error(error_msg)
             return False, error_msg
         
-        # 检查无穷大值
-        if np.any(np.isinf(x_data)) or np.any(np.isinf(y_data)):
-            error_msg = "数据包含无穷大值（Inf）"
-            logger.error(error_msg)
-            return False, error_msg
-        
-        return True, ""
+        # 其余均为无穷大值
+        error_msg = "数据包含无穷大值（Inf）"
+        logger.error(error_msg)
+        return False, error_msg
     
     def check_data_loaded(self, data_type: str = 'original') -> Tuple[bool, str]:
         """
@@ -171,24 +201,26 @@ class DataManager:
         else:
             return self.y_data
     
-    def set_smoothed_data(self, data: np.ndarray):
+    def set_smoothed_data(self, data: np.ndarray, copy: bool = True):
         """
         设置平滑后的数据
         
         Args:
             data: 平滑后的数据
+            copy: 是否复制数据；传入新计算出且不再被其他地方修改的数组时可设为False，避免多余的内存分配
         """
-        self.smoothed_data = data.copy()
+        self.smoothed_data = data.copy() if copy else data
         logger.info("平滑数据已更新")
     
-    def set_corrected_data(self, data: np.ndarray):
+    def set_corrected_data(self, data: np.ndarray, copy: bool = True):
         """
         设置基线校正后的数据
         
         Args:
             data: 校正后的数据
+            copy: 是否复制数据；传入新计算出且不再被其他地方修改的数组时可设为False，避免多余的内存分配
         """
-        self.corrected_data = data.copy()
+        self.corrected_data = data.copy() if copy else data
         logger.info("校正数据已更新")
     
     def export_to_csv(self, file_path: str, data_type: str = 'smoothed') -> Tuple[bool, str]:
@@ -213,12 +245,15 @@ class DataManager:
             if y_data is None:
                 return False, f"没有可用的{data_type}数据"
             
-            # 创建DataFrame并导出
-            df = pd.DataFrame({
-                '波数 (cm^-1)': self.x_data,
-                '吸光度': y_data
-            })
-            df.to_csv(file_path, index=False, encoding='utf-8-sig')
+            # 直接逐行写入CSV，无需构造DataFrame；tolist() 转为Python浮点数，输出与 to_csv 相同的最短表示
+            # 按块转换，长光谱导出时不会一次生成整条数据的Python浮点数列表
+            chunk = self.EXPORT_CHUNK_ROWS
+            with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['波数 (cm^-1)', '吸光度'])
+                for start in range(0, len(self.x_data), chunk):
+                    writer.writerows(zip(self.x_data[start:start + chunk].tolist(),
+                                         y_data[start:start + chunk].tolist()))
             
             success_msg = f"{data_type}数据导出成功"
             logger.info(f"数据导出到: {file_path}")
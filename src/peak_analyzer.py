@@ -28,8 +28,78 @@ class PeakAnalyzer:
         """初始化峰分析器"""
         self.peaks = []  # 存储识别到的峰位置
         self.peak_properties = {}  # 存储峰的属性
+        self._order_x_data = None  # _x_order 对应的X轴数据
+        self._x_order = 0  # X轴单调方向：1升序，-1降序，0非单调
         logger.info("峰分析器初始化完成")
     
+    def _range_selector(self, x_data: np.ndarray, lower: float, upper: float):
+        """
+        获取 [lower, upper] 范围内数据点的选择器
+        
+        X轴单调（升序或FTIR常见的降序）时用两次二分查找得到连续切片，
+        取出的是原数组的视图，不必生成整条布尔掩码再复制数据；非单调时回退为布尔掩码。
+        X轴的单调方向按数组对象缓存，同一数据重复分析时不再重新判断。
+        
+        Args:
+            x_data: X轴数据（波数）
+            lower: 范围下限
+            upper: 范围上限
+            
+        Returns:
+            slice 或 np.ndarray: 可直接用于索引的选择器
+        """
+        if x_data is not self._order_x_data:
+            diffs = np.diff(x_data)
+            if np.all(diffs >= 0):
+                self._x_order = 1
+            elif np.all(diffs <= 0):
+                self._x_order = -1
+            else:
+                self._x_order = 0
+            self._order_x_data = x_data
+        
+        if self._x_order == 1:
+            start = np.searchsorted(x_data, lower, side='left')
+            end = np.searchsorted(x_data, upper, side='right')
+            return slice(start, max(start, end))
+        if self._x_order == -1:
+            n = len(x_data)
+            reversed_x = x_data[::-1]
+            start = np.searchsorted(reversed_x, lower, side='left')
+            end = np.searchsorted(reversed_x, upper, side='right')
+            return slice(n - max(start, end), n - start)
+        return (x_data >= lower) & (x_data <= upper)
+    
+    def _nearest_index(self, x_range: np.ndarray, value: float) -> int:
+        """
+        查找分析范围内与目标值最接近的数据点索引
+        
+        X轴单调时（_range_selector 已判断方向）用二分查找，否则回退为线性扫描；
+        距离相同时取靠前的点，与 np.argmin(np.abs(x_range - value)) 一致。
+        
+        Args:
+            x_range: 分析范围内的X轴数据
+            value: 目标值
+            
+        Returns:
+            int: 最接近的数据点索引
+        """
+        n = len(x_range)
+        if self._x_order == 0 or n < 2:
+            return int(np.argmin(np.abs(x_range - value)))
+        
+        # 目标值两侧的相邻点，各取其数值第一次出现的位置（X轴有重复值时与 argmin 一致）
+        if self._x_order == 1:
+            pos = int(np.searchsorted(x_range, value))
+            candidates = [int(np.searchsorted(x_range, x_range[i], side='left'))
+                          for i in (pos - 1, pos) if 0 <= i < n]
+        else:
+            reversed_x = x_range[::-1]
+            pos = n - int(np.searchsorted(reversed_x, value))
+            candidates = [n - int(np.searchsorted(reversed_x, x_range[i], side='right'))
+                          for i in (pos - 1, pos) if 0 <= i < n]
+        return min(candidates, key=lambda i: (abs(x_range[i] - value), i))
+    
     def find_peaks_auto(self, x_data: np.ndarray, y_data: np.ndarray,
                         threshold: float, min_distance: int) -> Tuple[bool, List[Tuple[float, float]], str]:
         """
@@ -72,12 +142,9 @@ class PeakAnalyzer:
             self.peaks = peak_indices
             self.peak_properties = properties
             
-            # 构建峰列表
-            peak_list = []
-            for idx in peak_indices:
-                wavenumber = x_data[idx]
-                height = y_data[idx]
-                peak_list.append((float(wavenumber), float(height)))
+            # 构建峰列表（一次花式索引取出全部峰，tolist() 直接得到Python浮点数）
+            peak_list = list(zip(np.asarray(x_data, dtype=np.float64)[peak_indices].tolist(),
+                                 np.asarray(y_data, dtype=np.float64)[peak_indices].tolist()))
             
             logger.info(f"找到 {len(peak_list)} 个峰")
             return True, peak_list, ""
@@ -122,9 +189,9 @@ class PeakAnalyzer:
                 return False, {}, error_msg
             
             # 获取分析范围内的数据
-            mask = (x_data >= lower_limit) & (x_data <= upper_limit)
-            x_range = x_data[mask]
-            y_range = y_data[mask]
+            selector = self._range_selector(x_data, lower_limit, upper_limit)
+            x_range = x_data[selector]
+            y_range = y_data[selector]
             
             if len(x_range) == 0:
                 error_msg = f"范围 [{lower_limit}, {upper_limit}] 内没有数据点"
@@ -138,7 +205,7 @@ class PeakAnalyzer:
                 return False, {}, error_msg
 
             # 找到峰位置的索引
-            peak_idx = np.argmin(np.abs(x_range - peak_wavenumber))
+            peak_idx = self._nearest_index(x_range, peak_wavenumber)
             peak_x = x_range[peak_idx]
             peak_y = y_range[peak_idx]
 
@@ -150,7 +217,6 @@ class PeakAnalyzer:
             else:
                 baseline_slope = (y_range[-1] - y_range[0]) / x_diff
             baseline_intercept = y_range[0] - baseline_slope * x_range[0]
-            y_baseline = baseline_slope * x_range + baseline_intercept
             
             # 计算基线在峰位置的高度
             baseline_at_peak = baseline_slope * peak_x + baseline_intercept
@@ -163,20 +229,25 @@ class PeakAnalyzer:
             # 【修复】兼容 NumPy 旧版本，使用 trapz 而不是 trapezoid
             try:
                 uncorrected_area = np.trapezoid(y_range, x_range)
-                corrected_area = np.trapezoid(y_range - y_baseline, x_range)
             except AttributeError:
                 uncorrected_area = np.trapz(y_range, x_range)
-                corrected_area = np.trapz(y_range - y_baseline, x_range)
+            # 直线基线的梯形积分是精确的，直接用两端点的基线值求出基线下面积，
+            # 无需构造基线数组再做一次积分
+            baseline_start = baseline_slope * x_range[0] + baseline_intercept
+            baseline_end = baseline_slope * x_range[-1] + baseline_intercept
+            baseline_area = 0.5 * (baseline_start + baseline_end) * x_diff
+            corrected_area = uncorrected_area - baseline_area
 
             # 如果提供了基线数据，也计算相对于基线的参数
             if baseline_y_data is not None:
-                baseline_range = baseline_y_data[mask]
+                baseline_range = baseline_y_data[selector]
                 baseline_at_peak_corrected = baseline_range[peak_idx]
                 corrected_height_vs_baseline = peak_y - baseline_at_peak_corrected
+                # 积分是线性的，复用已算出的未校正面积，只需再积分基线本身，不必构造差值数组
                 try:
-                    corrected_area_vs_baseline = np.trapezoid(y_range - baseline_range, x_range)
+                    corrected_area_vs_baseline = uncorrected_area - np.trapezoid(baseline_range, x_range)
                 except AttributeError:
-                    corrected_area_vs_baseline = np.trapz(y_range - baseline_range, x_range)
+                    corrected_area_vs_baseline = uncorrected_area - np.trapz(baseline_range, x_range)
             else:
                 corrected_height_vs_baseline = corrected_height
                 corrected_area_vs_baseline = corrected_area
@@ -5,10 +5,13 @@
 """
 
 import numpy as np
-from scipy.signal import savgol_filter, medfilt
-from scipy.ndimage import gaussian_filter1d
+from scipy.signal import savgol_coeffs, oaconvolve
+from scipy.ndimage import convolve1d, median_filter, uniform_filter1d
 from statsmodels.nonparametric.smoothers_lowess import lowess
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,21 @@ class SmoothingProcessor:
     - 中值滤波
     """
     
+    # 平滑方法名称 -> (处理方法名, 所需参数名)
+    SMOOTHING_METHODS = {
+        "savgol": ("smooth_savgol", ("window_length", "polyorder")),
+        "lowess": ("smooth_lowess", ("frac", "iterations")),
+        "moving_average": ("smooth_moving_average", ("window_length",)),
+        "gaussian": ("smooth_gaussian", ("sigma",)),
+        "median": ("smooth_median", ("window_length",)),
+    }
+    
+    # 数据点数与卷积核长度之积超过该值时，高斯滤波改用重叠相加FFT卷积
+    GAUSSIAN_FFT_THRESHOLD = 100000
+    
+    # LOWESS向量化计算时每批处理的邻域元素数（行数 × 邻域点数），用于限制临时数组内存
+    LOWESS_BLOCK_SIZE = 65536
+    
     def __init__(self):
         """初始化平滑处理器"""
         logger.info("平滑处理器初始化完成")
@@ -106,6 +124,34 @@ class SmoothingProcessor:
             return False, f"{param_name}必须在{min_val}到{max_val}之间，当前值: {value}"
         return True, ""
     
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _get_savgol_kernels(window_length: int, polyorder: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取Savitzky-Golay滤波的卷积系数和边缘拟合矩阵（按参数缓存）
+        
+        边缘点的多项式拟合结果是窗口内数据的线性组合，
+        拟合矩阵只与窗口长度和多项式阶数有关，因此可以与卷积系数一起预先计算。
+        
+        Args:
+            window_length: 窗口长度
+            polyorder: 多项式阶数
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (卷积系数, 边缘拟合矩阵)
+        """
+        coeffs = savgol_coeffs(window_length, polyorder)
+        
+        # 窗口内多项式最小二乘拟合的投影矩阵（自变量缩放到[-1, 1]以保证数值稳定）
+        half = window_length // 2
+        t = (np.arange(window_length) - half) / max(half, 1)
+        q, _ = np.linalg.qr(np.vander(t, polyorder + 1, increasing=True))
+        projection = q @ q.T
+        
+        coeffs.setflags(write=False)
+        projection.setflags(write=False)
+        return coeffs, projection
+    
     def smooth_savgol(self, x_data: np.ndarray, y_data: np.ndarray, 
                       window_length: int, polyorder: int) -> Tuple[bool, np.ndarray, str]:
         """
@@ -127,7 +173,14 @@ class SmoothingProcessor:
                 logger.error(f"Savgol参数验证失败: {error_msg}")
                 return False, y_data, error_msg
             
-            smoothed = savgol_filter(y_data, window_length, polyorder)
+            # 与 savgol_filter(mode='interp') 结果一致：内部卷积，两端各半个窗口用多项式拟合
+            coeffs, projection = self._get_savgol_kernels(window_length, polyorder)
+            y = np.asarray(y_data, dtype=np.float64)
+            smoothed = convolve1d(y, coeffs, mode='constant')
+            half = window_length // 2
+            if half > 0:
+                smoothed[:half] = projection[:half] @ y[:window_length]
+                smoothed[-half:] = projection[-half:] @ y[-window_length:]
             logger.info(f"Savgol平滑完成: window={window_length}, poly={polyorder}")
             return True, smoothed, ""
             
@@ -162,7 +215,10 @@ class SmoothingProcessor:
                 logger.error(f"LOWESS参数验证失败: {error_msg}")
                 return False, y_data, error_msg
             
-            smoothed = lowess(y_data, x_data, frac=frac, it=iterations, return_sorted=False)
+            # 实时预览与正式平滑常以相同数据和参数重复计算，按数据内容缓存结果
+            x = np.ascontiguousarray(x_data, dtype=np.float64)
+            y = np.ascontiguousarray(y_data, dtype=np.float64)
+            smoothed = self._lowess_cached(x.tobytes(), y.tobytes(), float(frac), int(iterations)).copy()
             logger.info(f"LOWESS平滑完成: frac={frac}, iterations={iterations}")
             return True, smoothed, ""
             
@@ -171,6 +227,121 @@ class SmoothingProcessor:
             logger.exception(error_msg)
             return False, y_data, error_msg
     
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _lowess_cached(x_bytes: bytes, y_bytes: bytes, frac: float, iterations: int) -> np.ndarray:
+        """
+        计算LOWESS平滑结果（按数据内容和参数缓存）
+        
+        以数据的字节内容为键：范围切片每次都是新的数组对象，按对象缓存无法命中。
+        
+        Args:
+            x_bytes: X轴数据（float64）的字节内容
+            y_bytes: Y轴数据（float64）的字节内容
+            frac: 平滑分数（0-1之间）
+            iterations: 迭代次数
+            
+        Returns:
+            np.ndarray: 平滑后的数据（只读）
+        """
+        x_data = np.frombuffer(x_bytes, dtype=np.float64)
+        y_data = np.frombuffer(y_bytes, dtype=np.float64)
+        smoothed = SmoothingProcessor._lowess(x_data, y_data, frac, iterations)
+        if smoothed is None:
+            # 含非有限值、邻域退化或稳健权重退化时回退到statsmodels实现
+            smoothed = lowess(y_data, x_data, frac=frac, it=iterations, return_sorted=False)
+        smoothed.setflags(write=False)
+        return smoothed
+    
+    @classmethod
+    def _lowess(cls, x_data: np.ndarray, y_data: np.ndarray,
+                frac: float, iterations: int) -> Optional[np.ndarray]:
+        """
+        向量化的LOWESS实现，算法与statsmodels的lowess（delta=0, return_sorted=False）相同
+        
+        statsmodels逐点拟合时每个点都要清零整个权重数组，复杂度 O(N²)；
+        这里用searchsorted一次性求出所有点的邻域起点，再按批对邻域矩阵做加权线性回归。
+        
+        Args:
+            x_data: X轴数据
+            y_data: Y轴数据
+            frac: 平滑分数（0-1之间）
+            iterations: 稳健迭代次数
+            
+        Returns:
+            Optional[np.ndarray]: 按原始顺序排列的平滑结果；无法向量化处理或稳健权重退化时返回None
+        """
+        x = np.asarray(x_data, dtype=float)
+        y = np.asarray(y_data, dtype=float)
+        if x.ndim != 1 or x.shape != y.shape or x.size < 2:
+            return None
+        if not (np.all(np.isfinite(x)) and np.all(np.isfinite(y))):
+            return None
+        
+        order = np.argsort(x)
+        xs = x[order]
+        ys = y[order]
+        n = xs.size
+        k = min(max(int(frac * n + 1e-10), 2), n)
+        
+        # 邻域 [left, left + k)：当前点超过窗口两端中点时窗口右移
+        mid = (xs[:n - k] + xs[k:]) / 2.0
+        left = np.searchsorted(mid, xs, side='left')
+        radius = np.maximum(xs - xs[left], xs[left + k - 1] - xs)
+        if np.any(radius <= 0):
+            return None
+        
+        # x相同的点沿用该组第一个点的拟合值
+        first = np.concatenate(([0], np.flatnonzero(np.diff(xs)) + 1))
+        run_start = np.repeat(first, np.diff(np.append(first, n)))
+        
+        offsets = np.arange(k)
+        rows = max(1, cls.LOWESS_BLOCK_SIZE // k)
+        resid_weights = np.ones(n)
+        fitted = np.empty(n)
+        
+        for step in range(iterations + 1):
+            for start in range(0, n, rows):
+                end = min(start + rows, n)
+                idx = left[start:end, None] + offsets
+                u = xs[idx] - xs[start:end, None]
+                dist = np.abs(u) / radius[start:end, None]
+                tri = 1.0 - dist * dist * dist
+                w = tri * tri * tri * resid_weights[idx]
+                yw = ys[idx]
+                
+                reg_ok = np.count_nonzero(w > 1e-12, axis=1) >= 2
+                w_sum = w.sum(axis=1)
+                w_sum[~reg_ok] = 1.0
+                wu = w * u
+                mean_u = wu.sum(axis=1) / w_sum
+                var_u = np.einsum('ij,ij->i', wu, u) / w_sum - mean_u * mean_u
+                # 【修复】有效点的X几乎重合（如重复X且其余点稳健权重为0）时斜率由舍入误差决定，交回statsmodels
+                if np.any(reg_ok & (var_u <= 1e-12)):
+                    return None
+                var_u = np.maximum(var_u, 1e-12)
+                mean_y = np.einsum('ij,ij->i', w, yw) / w_sum
+                cov_uy = np.einsum('ij,ij->i', wu, yw) / w_sum - mean_u * mean_y
+                fitted[start:end] = np.where(reg_ok, mean_y - mean_u * cov_uy / var_u, ys[start:end])
+            
+            fitted = fitted[run_start]
+            if step == iterations:
+                break
+            
+            # 双平方稳健权重
+            resid = np.abs(ys - fitted)
+            median = np.median(resid)
+            # 【修复】中位残差为0或仅剩舍入误差时（阶跃、离散取值等退化数据），statsmodels把所有非零残差的
+            # 权重直接置0，结果取决于残差是否恰好为0，向量化的运算顺序无法复现，交回statsmodels逐点计算
+            if median <= 1e-9 * max(np.max(np.abs(ys)), 1.0):
+                return None
+            r = np.minimum(resid / (6.0 * median), 1.0)
+            resid_weights = (1.0 - r * r) ** 2
+        
+        result = np.empty(n)
+        result[order] = fitted
+        return result
+    
     def smooth_moving_average(self, x_data: np.ndarray, y_data: np.ndarray,
                               window_length: int) -> Tuple[bool, np.ndarray, str]:
         """
@@ -196,7 +367,10 @@ class SmoothingProcessor:
                 logger.error(error_msg)
                 return False, y_data, error_msg
             
-            smoothed = np.convolve(y_data, np.ones(window_length) / window_length, mode='same')
+            # 与 np.convolve(y, np.ones(w) / w, mode='same') 一致（两端窗口外按0计，仍除以窗口长度）；
+            # uniform_filter1d 在C循环中维护滑动窗口和，复杂度 O(N)，与窗口长度无关
+            smoothed = uniform_filter1d(np.asarray(y_data, dtype=np.float64), size=window_length,
+                                        mode='constant', cval=0.0)
             logger.info(f"移动平均平滑完成: window={window_length}")
             return True, smoothed, ""
             
@@ -205,6 +379,26 @@ class SmoothingProcessor:
             logger.exception(error_msg)
             return False, y_data, error_msg
     
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _get_gaussian_kernel(sigma: float, truncate: float = 4.0) -> np.ndarray:
+        """
+        获取截断的归一化高斯卷积核（按参数缓存，与 gaussian_filter1d 使用的核一致）
+        
+        Args:
+            sigma: 标准差
+            truncate: 截断位置（标准差的倍数）
+            
+        Returns:
+            np.ndarray: 长度为 2 * radius + 1 的卷积核
+        """
+        radius = int(truncate * float(sigma) + 0.5)
+        x = np.arange(-radius, radius + 1)
+        kernel = np.exp(-0.5 / (sigma * sigma) * x ** 2)
+        kernel /= kernel.sum()
+        kernel.setflags(write=False)
+        return kernel
+    
     def smooth_gaussian(self, x_data: np.ndarray, y_data: np.ndarray,
                         sigma: float) -> Tuple[bool, np.ndarray, str]:
         """
@@ -225,7 +419,14 @@ class SmoothingProcessor:
                 logger.error(f"高斯滤波参数验证失败: {error_msg}")
                 return False, y_data, error_msg
             
-            smoothed = gaussian_filter1d(y_data, sigma)
+            # 与 gaussian_filter1d(mode='reflect') 结果一致；数据量和核都较大时使用FFT卷积
+            kernel = self._get_gaussian_kernel(float(sigma))
+            y = np.asarray(y_data, dtype=np.float64)
+            if y.size * kernel.size > self.GAUSSIAN_FFT_THRESHOLD:
+                radius = kernel.size // 2
+                smoothed = oaconvolve(np.pad(y, radius, mode='symmetric'), kernel, mode='valid')
+            else:
+                smoothed = convolve1d(y, kernel, mode='reflect')
             logger.info(f"高斯滤波平滑完成: sigma={sigma}")
             return True, smoothed, ""
             
@@ -234,6 +435,28 @@ class SmoothingProcessor:
             logger.exception(error_msg)
             return False, y_data, error_msg
     
+    @staticmethod
+    def _median3(y_data: np.ndarray) -> np.ndarray:
+        """
+        窗口长度为3的中值滤波（去尖峰最常用的窗口）
+        
+        三个数的中值等于 max(min(a, b), min(max(a, b), c))，用几次逐元素 min/max 代替
+        通用的选择算法；两端按0填充，结果与 median_filter(mode='constant') 一致。
+        
+        Args:
+            y_data: Y轴数据
+            
+        Returns:
+            np.ndarray: 中值滤波结果
+        """
+        padded = np.zeros(len(y_data) + 2)
+        padded[1:-1] = y_data
+        left, center, right = padded[:-2], padded[1:-1], padded[2:]
+        low = np.minimum(left, center)
+        high = np.maximum(left, center)
+        np.minimum(high, right, out=high)
+        return np.maximum(low, high, out=low)
+    
     def smooth_median(self, x_data: np.ndarray, y_data: np.ndarray,
                       window_length: int) -> Tuple[bool, np.ndarray, str]:
         """
@@ -254,12 +477,21 @@ class SmoothingProcessor:
                 logger.error(f"中值滤波参数验证失败: {error_msg}")
                 return False, y_data, error_msg
             
+            if window_length % 2 == 0:
+                error_msg = f"窗口长度必须是奇数，当前值: {window_length}"
+                logger.error(f"中值滤波参数验证失败: {error_msg}")
+                return False, y_data, error_msg
+            
             if window_length > len(y_data):
                 error_msg = f"窗口长度({window_length})不能大于数据长度({len(y_data)})"
                 logger.error(error_msg)
                 return False, y_data, error_msg
             
-            smoothed = medfilt(y_data, window_length)
+            # 与 medfilt 结果一致（两端按0填充），使用 ndimage 的选择算法，比 medfilt 的逐点排序更快
+            if window_length == 3:
+                smoothed = self._median3(y_data)
+            else:
+                smoothed = median_filter(y_data, size=window_length, mode='constant', cval=0.0)
             logger.info(f"中值滤波平滑完成: window={window_length}")
             return True, smoothed, ""
             
@@ -268,6 +500,53 @@ class SmoothingProcessor:
             logger.exception(error_msg)
             return False, y_data, error_msg
     
+    @staticmethod
+    def _monotonic_order(x_data: np.ndarray) -> int:
+        """
+        判断X轴数据的单调方向
+        
+        Args:
+            x_data: X轴数据
+            
+        Returns:
+            int: 1表示升序，-1表示降序，0表示非单调
+        """
+        diffs = np.diff(x_data)
+        if np.all(diffs >= 0):
+            return 1
+        if np.all(diffs <= 0):
+            return -1
+        return 0
+    
+    @staticmethod
+    def _range_selector(x_data: np.ndarray, start: float, end: float, order: int):
+        """
+        获取 [start, end] 范围内数据点的选择器
+        
+        单调数据返回连续切片（零拷贝视图，两次二分查找）；非单调数据回退为布尔掩码。
+        两种方式选出的数据点及其顺序相同。
+        
+        Args:
+            x_data: X轴数据
+            start: 范围起点
+            end: 范围终点
+            order: _monotonic_order 的返回值
+            
+        Returns:
+            slice 或 np.ndarray: 可直接用于索引的选择器
+        """
+        if order == 1:
+            lo = np.searchsorted(x_data, start, side='left')
+            hi = np.searchsorted(x_data, end, side='right')
+            return slice(lo, max(lo, hi))
+        if order == -1:
+            n = len(x_data)
+            reversed_x = x_data[::-1]
+            lo = np.searchsorted(reversed_x, start, side='left')
+            hi = np.searchsorted(reversed_x, end, side='right')
+            return slice(n - max(lo, hi), n - lo)
+        return (x_data >= start) & (x_data <= end)
+    
     def smooth_data_in_ranges(self, x_data: np.ndarray, y_data: np.ndarray,
                               ranges: List[Tuple[float, float]], method: str,
                               **params) -> Tuple[bool, np.ndarray, str]:
@@ -292,45 +571,50 @@ class SmoothingProcessor:
             else:
                 logger.info(f"在{len(ranges)}个范围内进行平滑处理")
             
+            # 在循环外确定平滑算法及其参数，避免对每个范围重复分派
+            if method not in self.SMOOTHING_METHODS:
+                return False, y_data, f"未知的平滑方法: {method}"
+            method_name, param_names = self.SMOOTHING_METHODS[method]
+            smooth_func = getattr(self, method_name)
+            method_args = [params[name] for name in param_names]
+            
             # 初始化结果数据
             smoothed_data = y_data.copy()
             
-            # 对每个范围进行处理
+            # 波数轴单调时用二分查找得到连续切片，避免每个范围都做布尔掩码扫描
+            x_order = self._monotonic_order(x_data)
+            
+            # 收集各范围的数据
+            tasks = []
             for start, end in ranges:
                 # 获取范围内的数据
-                mask = (x_data >= start) & (x_data <= end)
-                x_range = x_data[mask]
-                y_range = y_data[mask]
+                selector = self._range_selector(x_data, start, end, x_order)
+                x_range = x_data[selector]
+                y_range = y_data[selector]
                 
                 # 检查数据长度
                 if len(y_range) == 0:
                     logger.warning(f"范围 [{start}, {end}] 内没有数据点")
                     continue
-                
-                # 根据方法选择平滑算法
-                if method == "savgol":
-                    success, smoothed_range, error_msg = self.smooth_savgol(
-                        x_range, y_range, params['window_length'], params['polyorder'])
-                elif method == "lowess":
-                    success, smoothed_range, error_msg = self.smooth_lowess(
-                        x_range, y_range, params['frac'], params['iterations'])
-                elif method == "moving_average":
-                    success, smoothed_range, error_msg = self.smooth_moving_average(
-                        x_range, y_range, params['window_length'])
-                elif method == "gaussian":
-                    success, smoothed_range, error_msg = self.smooth_gaussian(
-                        x_range, y_range, params['sigma'])
-                elif method == "median":
-                    success, smoothed_range, error_msg = self.smooth_median(
-                        x_range, y_range, params['window_length'])
-                else:
-                    return False, y_data, f"未知的平滑方法: {method}"
-                
+                tasks.append((selector, x_range, y_range))
+            
+            # 各范围相互独立（均基于原始数据计算），多个范围时用线程池并行处理；
+            # SciPy/NumPy 的计算会释放GIL
+            if len(tasks) > 1:
+                workers = min(len(tasks), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(
+                        lambda task: smooth_func(task[1], task[2], *method_args), tasks))
+            else:
+                results = [smooth_func(x_range, y_range, *method_args) for _, x_range, y_range in tasks]
+            
+            # 按范围顺序写回结果（范围重叠时后面的范围覆盖前面的，与逐个处理一致）
+            for (selector, _, _), (success, smoothed_range, error_msg) in zip(tasks, results):
                 if not success:
                     return False, y_data, error_msg
                 
                 # 更新对应范围的数据
-                smoothed_data[mask] = smoothed_range
+                smoothed_data[selector] = smoothed_range
             
             logger.info(f"平滑处理完成，方法: {method}")
             return True, smoothed_data, ""